@@ -1,21 +1,33 @@
-from langchain_ollama import ChatOllama
-from langchain_core.chat_history import InMemoryChatMessageHistory
-from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
-from langchain_core.tools import Tool
-from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
 from sqlalchemy.orm import Session
 from typing import Optional, List, Dict, Any
+from types import SimpleNamespace
 import json
+import logging
+import os
+import threading
+import time
 
 # Import database components
-from database import SessionLocal
+from database import SessionLocal, init_db
 from models.tenant import Tenant
 from models.landlord import Landlord
 from models.property import Property
 from models.issue import Issue
 from models.contractor import Contractor
+from models.change import Change  # noqa: F401  records assistant writes in the change feed
+from models.issue_stats import IssueDailyStats  # noqa: F401  keeps issue analytics current
+from models.row_count import RowCount  # noqa: F401  keeps list totals current
+from write_coalescer import coalesced_create
+from intent import extract_issue
+import conversation_store
+import tenant_context
 from contextlib import contextmanager
 
+logger = logging.getLogger(__name__)
+
+# Ollama endpoint, overridable so the benchmark harness can point at a local fake
+OLLAMA_BASE_URL = os.getenv("OLLAMA_BASE_URL", "http://localhost:11434")
+
 # Define system prompt
 system_prompt = """
 You are an assistant that helps tenants with rental property issues.
@@ -150,7 +162,7 @@ def create_issue_in_db(
             issue_data["property_id"] = property_id
 
         try:
-            issue = Issue.create(db, issue_data)
+            issue = coalesced_create(db, Issue, issue_data)
             return {
                 "id": issue.id,
                 "description": issue.description,
@@ -164,23 +176,6 @@ def create_issue_in_db(
             return {"error": str(e)}
 
 
-# Define more tools for database interaction
-tools = [
-    # Keeping only the create_issue tool, removing all get_*_from_db tools
-    Tool(
-        func=create_issue_in_db,
-        name="create_issue_in_db",
-        description="Creates a new issue in the database. Requires description, location, and action. Property ID is optional.",
-        args_schema={
-            "description": "str",
-            "location": "str",
-            "action": "str",
-            "property_id": "Optional[int]",
-        },
-    ),
-]
-
-
 # Function to load all data at startup
 def load_all_data():
     """Load all data from the database at startup and return a formatted string representation."""
@@ -245,14 +240,42 @@ CONTRACTORS:
 """
 
 
-# Initialize memory
-history = InMemoryChatMessageHistory()
+# Define more tools for database interaction
+def build_tools():
+    from langchain_core.tools import Tool
+
+    return [
+        # Keeping only the create_issue tool, removing all get_*_from_db tools
+        Tool(
+            func=create_issue_in_db,
+            name="create_issue_in_db",
+            description="Creates a new issue in the database. Requires description, location, and action. Property ID is optional.",
+            args_schema={
+                "description": "str",
+                "location": "str",
+                "action": "str",
+                "property_id": "Optional[int]",
+            },
+        ),
+    ]
 
-# Load all data at startup
-database_contents = load_all_data()
 
-# Add database contents to system prompt
-enhanced_system_prompt = f"""
+def build_tenant_system_prompt(context: str) -> str:
+    """System prompt for a tenant-scoped conversation."""
+    return f"""
+{system_prompt}
+
+Here is the information about this tenant that you can reference:
+
+{context}
+
+Only use the create_issue_in_db tool when the tenant wants to create a new maintenance issue.
+"""
+
+
+def build_system_prompt(database_contents: str) -> str:
+    """Add database contents to the system prompt."""
+    return f"""
 {system_prompt}
 
 Here is the current database information that you can reference:
@@ -263,43 +286,153 @@ When asked about tenants, landlords, properties, issues, or contractors, use thi
 Only use the create_issue_in_db tool when a user wants to create a new maintenance issue.
 """
 
-# Set up the LLM with a prompt that supports tools and memory
-tool_llm = ChatOllama(
-    model="llama3.1",
-    temperature=0,
-    base_url="http://localhost:11434",
-).bind_tools(tools)
-
-llm = ChatOllama(
-    model="llama3.1",
-    temperature=0,
-    base_url="http://localhost:11434",
-)
-
-# Define a prompt template with the enhanced system prompt
-prompt = ChatPromptTemplate.from_messages(
-    [
-        ("system", enhanced_system_prompt),
-        MessagesPlaceholder(variable_name="chat_history"),
-        ("human", "{input}"),
-    ]
-)
 
-# Create a chain that combines prompt, LLM, and tools
-chain = prompt | llm
+# The assistant (LLM clients, prompt and database context) is built on
+# first use rather than at import, so importing this module does no I/O.
+_assistant = None
+_assistant_lock = threading.Lock()
+
+
+def _build_assistant():
+    # langchain is imported here as well; it dominates the import cost of this module
+    from langchain_ollama import ChatOllama
+    from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
+
+    started = time.perf_counter()
+
+    # The write hooks need their tables, also on a database the API never started on
+    init_db()
+
+    # Load all data at startup
+    database_contents = load_all_data()
+    enhanced_system_prompt = build_system_prompt(database_contents)
 
-# When starting a new conversation, add a system message with the database contents
-history.add_message(SystemMessage(content=enhanced_system_prompt))
+    # Set up the LLM with a prompt that supports tools and memory
+    tool_llm = ChatOllama(
+        model="llama3.1",
+        temperature=0,
+        base_url=OLLAMA_BASE_URL,
+    ).bind_tools(build_tools())
+
+    llm = ChatOllama(
+        model="llama3.1",
+        temperature=0,
+        base_url=OLLAMA_BASE_URL,
+    )
+
+    # The system text is filled per call: the global context, which is reloaded
+    # after issues are created, or a tenant's context from tenant_context
+    prompt = ChatPromptTemplate.from_messages(
+        [
+            ("system", "{system}"),
+            MessagesPlaceholder(variable_name="chat_history"),
+            ("human", "{input}"),
+        ]
+    )
+
+    startup_ms = (time.perf_counter() - started) * 1000
+    logger.info("Assistant initialized in %.1f ms", startup_ms)
+
+    # Conversation history lives in conversation_store, not on the assistant
+    return SimpleNamespace(
+        database_contents=database_contents,
+        enhanced_system_prompt=enhanced_system_prompt,
+        # Set when an issue is created; the next global-mode reply reloads the context
+        context_stale=False,
+        tool_llm=tool_llm,
+        llm=llm,
+        prompt=prompt,
+        # Create a chain that combines prompt, LLM, and tools
+        chain=prompt | llm,
+        startup_ms=startup_ms,
+    )
+
+
+def get_assistant():
+    """Return the assistant, building it on first use."""
+    global _assistant
+    if _assistant is None:
+        with _assistant_lock:
+            if _assistant is None:
+                _assistant = _build_assistant()
+    return _assistant
+
+
+def reset_assistant():
+    """Drop the assistant so the next call rebuilds it from the database."""
+    global _assistant
+    with _assistant_lock:
+        _assistant = None
+
+
+def warmup(background: bool = True):
+    """Build the assistant ahead of the first message, optionally in a daemon thread."""
+    if not background:
+        return get_assistant()
+    thread = threading.Thread(target=get_assistant, name="ai-warmup", daemon=True)
+    thread.start()
+    return thread
+
+
+def _create_issue_and_reply(assistant, args, reload_context: bool = True) -> str:
+    """Create an issue from tool-style arguments and return the reply for the tenant."""
+    tool_result = create_issue_in_db(
+        description=args.get("description", ""),
+        location=args.get("location", ""),
+        action=args.get("action", ""),
+        property_id=args.get("property_id"),
+    )
+
+    if "error" in tool_result:
+        response_content = f"I couldn't create the issue: {tool_result['error']}"
+    else:
+        response_content = f"I've created a new maintenance issue:\n- Description: {tool_result['description']}\n- Location: {tool_result['location']}\n- Action needed: {tool_result['action']}\n- Issue ID: {tool_result['id']}"
+
+    if reload_context and "error" not in tool_result:
+        # Reloaded only when a reply needs it, so the fast path stays query-free
+        assistant.context_stale = True
+    return response_content
+
+
+def _global_system_prompt(assistant) -> str:
+    """The global system prompt, reloaded from the database if an issue was created since."""
+    if assistant.context_stale:
+        assistant.context_stale = False
+        assistant.database_contents = load_all_data()
+        assistant.enhanced_system_prompt = build_system_prompt(assistant.database_contents)
+    return assistant.enhanced_system_prompt
 
 
 # Enhanced function to handle message sending and tool use
-def send_message(user_message):
+def send_message(user_message, tenant_id: Optional[int] = None):
+    """Answer ``user_message``; with ``tenant_id``, only that tenant's data is used as context."""
+    from langchain_core.messages import AIMessage, HumanMessage
+
+    assistant = get_assistant()
+    scoped = None
+    if tenant_id is not None:
+        scoped = tenant_context.get_tenant_context(tenant_id)
+        if scoped is None:
+            return f"Error: Tenant with ID {tenant_id} not found"
+    history = conversation_store.get_history(tenant_id)
+
+    # Messages of this turn, stored together with one insert once it's answered
+    turn = [HumanMessage(content=user_message)]
     try:
-        # Add user message to history
-        history.add_message(HumanMessage(content=user_message))
+        # Fast path: clear fault reports are created locally without any LLM call
+        issue_args = extract_issue(user_message)
+        if issue_args is not None:
+            if scoped is not None:
+                # A tenant can only report issues at their own property
+                issue_args["property_id"] = scoped["property_id"]
+            response_content = _create_issue_and_reply(
+                assistant, issue_args, reload_context=scoped is None
+            )
+            turn.append(AIMessage(content=response_content))
+            return response_content
 
         # Invoke tool llm with the same input
-        tool_response = tool_llm.invoke(input=user_message)
+        tool_response = assistant.tool_llm.invoke(input=user_message)
 
         # Check if a tool was called - now only the create_issue_in_db tool remains
         if tool_response.tool_calls:
@@ -307,53 +440,54 @@ def send_message(user_message):
             tool_name = tool_call["name"]
 
             if tool_name == "create_issue_in_db":
-                args = tool_call.get("args", {})
-                description = args.get("description", "")
-                location = args.get("location", "")
-                action = args.get("action", "")
-                property_id = args.get("property_id")
-
-                tool_result = create_issue_in_db(
-                    description=description,
-                    location=location,
-                    action=action,
-                    property_id=property_id,
+                args = dict(tool_call.get("args", {}))
+                if scoped is not None:
+                    args["property_id"] = scoped["property_id"]
+                response_content = _create_issue_and_reply(
+                    assistant, args, reload_context=scoped is None
                 )
-
-                if "error" in tool_result:
-                    response_content = (
-                        f"I couldn't create the issue: {tool_result['error']}"
-                    )
-                else:
-                    response_content = f"I've created a new maintenance issue:\n- Description: {tool_result['description']}\n- Location: {tool_result['location']}\n- Action needed: {tool_result['action']}\n- Issue ID: {tool_result['id']}"
-
-                history.add_message(AIMessage(content=response_content))
-
-                # Reload database data after creating an issue to keep context up to date
-                global database_contents, enhanced_system_prompt
-                database_contents = load_all_data()
-                enhanced_system_prompt = f"{system_prompt}\n\nHere is the current database information that you can reference:\n\n{database_contents}"
+                turn.append(AIMessage(content=response_content))
 
         # Invoke the chain with chat history and input
-        response = chain.invoke(
-            {
-                "input": user_message,
-                "chat_history": history.messages,
-            }
-        )
-        history.add_message(AIMessage(content=response.content))
+        chat_history = history.messages + turn
+        if scoped is None:
+            response = assistant.chain.invoke(
+                {
+                    "system": _global_system_prompt(assistant),
+                    "input": user_message,
+                    "chat_history": chat_history,
+                }
+            )
+        else:
+            # Re-read the context: the tool call above may have invalidated it
+            scoped = tenant_context.get_tenant_context(tenant_id) or scoped
+            response = assistant.chain.invoke(
+                {
+                    "system": build_tenant_system_prompt(scoped["context"]),
+                    "input": user_message,
+                    "chat_history": chat_history,
+                }
+            )
+        turn.append(AIMessage(content=response.content))
         return response.content
 
     except Exception as e:
         error_msg = f"Error: {str(e)}"
-        history.add_message(AIMessage(content=error_msg))
+        turn.append(AIMessage(content=error_msg))
         return error_msg
 
+    finally:
+        try:
+            history.add_messages(turn)
+        except Exception:
+            logger.exception("Could not store conversation turn for %s", history.key)
+
 
 # Example usage
 if __name__ == "__main__":
     print("Welcome to the Property Management Assistant!")
     print("Type 'exit' or 'quit' to leave the conversation.")
+    warmup()
     while True:
         user_input = input("You: ")
         if user_input.lower() in ["exit", "quit"]:
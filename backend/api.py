@@ -1,22 +1,128 @@
+import asyncio
+import json
+import logging
+import os
+import time
+from datetime import timedelta
+
+_import_started = time.perf_counter()
+
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI, Depends, HTTPException, Request, Query
+from fastapi.responses import JSONResponse, StreamingResponse
 from sqlalchemy.orm import Session
-from models.base import Base
+from models.base import DeleteRestricted
 from models.tenant import Tenant
 from models.contractor import Contractor
 from models.landlord import Landlord
 from models.property import Property
 from models.issue import Issue  # Add this import
-from database import SessionLocal, engine  # Updated import
+from models.change import Change
+from models.archived_issue import ArchivedIssue, RestoreConflict
+from models.issue_stats import IssueDailyStats
+from models.row_count import RowCount
+from models import address_index
+from database import SessionLocal, engine, init_db  # Updated import
+from middleware.compression_middleware import setup_compression
 from middleware.cors_middleware import setup_cors
+from middleware.metrics_middleware import setup_metrics
+from middleware.sql_middleware import run_untracked, setup_sql_instrumentation
+from write_coalescer import coalesced_create, stop_write_coalescer
 
 
-app = FastAPI()
+logger = logging.getLogger(__name__)
 
-setup_cors(app)
+# Change feed polling and background compaction
+CHANGE_POLL_INTERVAL = float(os.getenv("CHANGE_POLL_INTERVAL", "0.5"))
+CHANGE_COMPACT_INTERVAL = float(os.getenv("CHANGE_COMPACT_INTERVAL", "3600"))
+CHANGE_RETENTION = timedelta(hours=float(os.getenv("CHANGE_RETENTION_HOURS", "1")))
+
+# Row counters behind list totals are reconciled with COUNT(*) this often
+ROW_COUNT_REFRESH_INTERVAL = float(os.getenv("ROW_COUNT_REFRESH_INTERVAL", "3600"))
+
+# Resolved issues move to the archive table after this many days
+ISSUE_ARCHIVE_AFTER = timedelta(days=float(os.getenv("ISSUE_ARCHIVE_AFTER_DAYS", "30")))
+ISSUE_ARCHIVE_INTERVAL = float(os.getenv("ISSUE_ARCHIVE_INTERVAL", "3600"))
+
+
+async def run_periodically(interval: float, job, name: str):
+    """Run a blocking ``job`` in a worker thread every ``interval`` seconds."""
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await asyncio.to_thread(job)
+        except Exception:
+            logger.exception("Background job %s failed", name)
+
+
+def compact_changes():
+    with SessionLocal() as db:
+        removed = Change.compact(db, CHANGE_RETENTION)
+    logger.info("Compacted %d change log entries", removed)
+
+
+def archive_issues():
+    with SessionLocal() as db:
+        archived = ArchivedIssue.archive_resolved(db, ISSUE_ARCHIVE_AFTER)
+    logger.info("Archived %d resolved issues", archived)
+
+
+def refresh_row_counts():
+    with SessionLocal() as db:
+        RowCount.refresh(db)
+
+
+def backfill_address_index():
+    with SessionLocal() as db:
+        indexed = address_index.rebuild(db)
+    if indexed:
+        logger.info("Indexed %d property addresses", indexed)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    started = time.perf_counter()
 
-# Create the database tables
-Base.metadata.create_all(bind=engine)
+    # Create and migrate the database tables
+    init_db()
 
+    app.state.startup_ms = (time.perf_counter() - started) * 1000
+    logger.info(
+        "Startup completed in %.1f ms (%.1f ms since import)",
+        app.state.startup_ms,
+        (time.perf_counter() - _import_started) * 1000,
+    )
+    background = [
+        asyncio.create_task(asyncio.to_thread(backfill_address_index)),
+        asyncio.create_task(asyncio.to_thread(refresh_row_counts)),
+        asyncio.create_task(
+            run_periodically(ROW_COUNT_REFRESH_INTERVAL, refresh_row_counts, "refresh_row_counts")
+        ),
+        asyncio.create_task(
+            run_periodically(CHANGE_COMPACT_INTERVAL, compact_changes, "compact_changes")
+        ),
+        asyncio.create_task(
+            run_periodically(ISSUE_ARCHIVE_INTERVAL, archive_issues, "archive_issues")
+        ),
+    ]
+
+    yield
+
+    for task in background:
+        task.cancel()
+
+    # Flush any queued group-commit writes
+    stop_write_coalescer()
+
+
+app = FastAPI(lifespan=lifespan)
+
+# Innermost, so the metrics middleware records compressed response sizes
+setup_compression(app)
+setup_cors(app)
+setup_metrics(app)
+setup_sql_instrumentation(app, engine)
 
 # Dependency to get the database session
 def get_db():
@@ -27,6 +133,31 @@ def get_db():
         db.close()
 
 
+@app.exception_handler(DeleteRestricted)
+async def delete_restricted_handler(request: Request, exc: DeleteRestricted):
+    return JSONResponse(status_code=409, content={"detail": str(exc)})
+
+
+def parse_fields(model, fields, envelope: bool = False):
+    """Validate a ``?fields=`` sparse fieldset against ``model``'s columns.
+
+    Envelope responses always include ``id``, which ``next_cursor`` is taken from.
+    """
+    try:
+        return model.parse_fields(fields, required=("id",) if envelope else ())
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+def page(db: Session, items, limit: int, *models):
+    """Wrap a list in the ``?envelope=true`` shape: items, exact total and the next cursor."""
+    next_cursor = None
+    if items and len(items) >= limit:
+        last = items[-1]
+        next_cursor = last["id"] if isinstance(last, dict) else last.id
+    return {"items": items, "total": RowCount.total(db, *models), "next_cursor": next_cursor}
+
+
 # Tenant endpoints
 @app.post("/tenants/")
 async def create_tenant(
@@ -54,8 +185,16 @@ def read_tenant(tenant_id: int, db: Session = Depends(get_db)):
 
 
 @app.get("/tenants/")
-def read_tenants(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    return Tenant.get_all(db, skip, limit)
+def read_tenants(
+    skip: int = 0,
+    limit: int = 100,
+    fields: str = Query(None),
+    cursor: int = Query(None),
+    envelope: bool = False,
+    db: Session = Depends(get_db),
+):
+    items = Tenant.get_all(db, skip, limit, parse_fields(Tenant, fields, envelope), cursor)
+    return page(db, items, limit, Tenant) if envelope else items
 
 
 @app.put("/tenants/{tenant_id}")
@@ -121,8 +260,16 @@ def read_contractor(contractor_id: int, db: Session = Depends(get_db)):
 
 
 @app.get("/contractors/")
-def read_contractors(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    return Contractor.get_all(db, skip, limit)
+def read_contractors(
+    skip: int = 0,
+    limit: int = 100,
+    fields: str = Query(None),
+    cursor: int = Query(None),
+    envelope: bool = False,
+    db: Session = Depends(get_db),
+):
+    items = Contractor.get_all(db, skip, limit, parse_fields(Contractor, fields, envelope), cursor)
+    return page(db, items, limit, Contractor) if envelope else items
 
 
 @app.put("/contractors/{contractor_id}")
@@ -185,8 +332,16 @@ def read_landlord(landlord_id: int, db: Session = Depends(get_db)):
 
 
 @app.get("/landlords/")
-def read_landlords(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    return Landlord.get_all(db, skip, limit)
+def read_landlords(
+    skip: int = 0,
+    limit: int = 100,
+    fields: str = Query(None),
+    cursor: int = Query(None),
+    envelope: bool = False,
+    db: Session = Depends(get_db),
+):
+    items = Landlord.get_all(db, skip, limit, parse_fields(Landlord, fields, envelope), cursor)
+    return page(db, items, limit, Landlord) if envelope else items
 
 
 @app.put("/landlords/{landlord_id}")
@@ -229,6 +384,16 @@ def create_property(
     return Property.create(db, property_data)
 
 
+@app.get("/properties/autocomplete")
+def autocomplete_properties(
+    q: str = Query(..., min_length=1),
+    landlord_id: int = Query(None),
+    limit: int = Query(10, ge=1, le=50),
+    db: Session = Depends(get_db),
+):
+    return address_index.autocomplete(db, q, landlord_id, limit)
+
+
 @app.get("/properties/{property_id}")
 def read_property(property_id: int, db: Session = Depends(get_db)):
     property_obj = Property.get(db, property_id)
@@ -238,8 +403,16 @@ def read_property(property_id: int, db: Session = Depends(get_db)):
 
 
 @app.get("/properties/")
-def read_properties(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    return Property.get_all(db, skip, limit)
+def read_properties(
+    skip: int = 0,
+    limit: int = 100,
+    fields: str = Query(None),
+    cursor: int = Query(None),
+    envelope: bool = False,
+    db: Session = Depends(get_db),
+):
+    items = Property.get_all(db, skip, limit, parse_fields(Property, fields, envelope), cursor)
+    return page(db, items, limit, Property) if envelope else items
 
 
 @app.put("/properties/{property_id}")
@@ -292,20 +465,47 @@ def create_issue(
             raise HTTPException(status_code=404, detail="Property not found")
         issue_data["property_id"] = property_id
 
-    return Issue.create(db, issue_data)
+    return coalesced_create(db, Issue, issue_data)
 
 
 @app.get("/issues/{issue_id}")
 def read_issue(issue_id: int, db: Session = Depends(get_db)):
     issue = Issue.get(db, issue_id)
+    if issue is None:
+        # Fall back to the archive so old links keep working
+        issue = ArchivedIssue.get(db, issue_id)
     if issue is None:
         raise HTTPException(status_code=404, detail="Issue not found")
     return issue
 
 
 @app.get("/issues/")
-def read_issues(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    return Issue.get_all(db, skip, limit)
+def read_issues(
+    skip: int = 0,
+    limit: int = 100,
+    include_archived: bool = False,
+    fields: str = Query(None),
+    cursor: int = Query(None),
+    envelope: bool = False,
+    db: Session = Depends(get_db),
+):
+    selected = parse_fields(Issue, fields, envelope)
+    if include_archived:
+        items = ArchivedIssue.get_all_with_live(db, skip, limit, selected, cursor)
+        return page(db, items, limit, Issue, ArchivedIssue) if envelope else items
+    items = Issue.get_all(db, skip, limit, selected, cursor)
+    return page(db, items, limit, Issue) if envelope else items
+
+
+@app.post("/issues/{issue_id}/restore")
+def restore_issue(issue_id: int, reopen: bool = False, db: Session = Depends(get_db)):
+    try:
+        issue = ArchivedIssue.restore(db, issue_id, reopen)
+    except RestoreConflict as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    if issue is None:
+        raise HTTPException(status_code=404, detail="Archived issue not found")
+    return issue
 
 
 @app.put("/issues/{issue_id}")
@@ -347,6 +547,80 @@ def delete_issue(issue_id: int, db: Session = Depends(get_db)):
     return {"detail": "Issue deleted"}
 
 
+
+# Analytics endpoints
+@app.get("/analytics/issues")
+def read_issue_analytics(
+    property_id: int = Query(None),
+    days: int = Query(30, ge=1, le=366),
+    db: Session = Depends(get_db),
+):
+    return IssueDailyStats.report(db, property_id, days)
+
+
+# Change feed endpoints
+def poll_changes(db: Session, since: int, limit: int = 1000):
+    """One change feed poll, as dicts; ends the read transaction so the next poll sees new commits."""
+    changes = [change.to_dict() for change in Change.since(db, since, limit)]
+    db.rollback()
+    return changes
+
+
+@app.get("/changes")
+async def read_changes(
+    since: int = 0,
+    limit: int = Query(1000, le=10000),
+    wait: float = Query(0, ge=0, le=60),
+    db: Session = Depends(get_db),
+):
+    """Changes after ``since``; with ``wait`` > 0, long-poll until one arrives or time runs out."""
+    deadline = time.monotonic() + wait
+    while True:
+        # Blocking queries run in a worker thread, so a locked database can't stall the event loop
+        changes = await asyncio.to_thread(run_untracked, poll_changes, db, since, limit)
+        if changes or time.monotonic() >= deadline:
+            break
+        await asyncio.sleep(CHANGE_POLL_INTERVAL)
+
+    return {
+        "changes": changes,
+        "last_seq": changes[-1]["seq"] if changes else since,
+    }
+
+
+@app.get("/changes/stream")
+async def stream_changes(request: Request, since: int = 0):
+    """Server-sent events for every change after ``since`` (or the Last-Event-ID header)."""
+    last_event_id = request.headers.get("last-event-id")
+    try:
+        last_seq = since if last_event_id is None else int(last_event_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid Last-Event-ID header")
+
+    def poll(seq):
+        with SessionLocal() as db:
+            return poll_changes(db, seq)
+
+    async def events():
+        nonlocal last_seq
+        idle = 0.0
+        while not await request.is_disconnected():
+            changes = await asyncio.to_thread(run_untracked, poll, last_seq)
+            for change in changes:
+                last_seq = change["seq"]
+                yield f"id: {change['seq']}\ndata: {json.dumps(change)}\n\n"
+            if changes:
+                idle = 0.0
+            else:
+                idle += CHANGE_POLL_INTERVAL
+                if idle >= 15:
+                    idle = 0.0
+                    yield ": keep-alive\n\n"
+                await asyncio.sleep(CHANGE_POLL_INTERVAL)
+
+    return StreamingResponse(events(), media_type="text/event-stream")
+
+
 if __name__ == "__main__":
     import uvicorn
 
@@ -0,0 +1,354 @@
+"""Benchmark harness for the assistant pipeline in ai.py.
+
+Runs ``ai.send_message`` against a deterministic fake Ollama server on
+localhost and a throwaway SQLite database, replaying scripted conversations
+(including create-issue tool calls) at increasing database sizes.
+
+For every scale it records:
+- context build time (``ai.load_all_data``, or the tenant's own context
+  from ``tenant_context.get_tenant_context`` with ``--tenant-id``)
+- LLM calls per turn
+- approximate prompt tokens sent to the model
+- end-to-end latency of ``send_message``
+- errors: error replies, and turns that did not create exactly the issues
+  their script expects
+
+Pass ``--tenant-id`` to replay in tenant-scoped mode.
+
+Usage (from the backend directory):
+
+    python bench_ai.py --scales 10,100,1000 --repeat 3
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional
+
+# Scripted conversations. ``tool_call`` is returned for the tool-bound request,
+# ``reply`` for the plain chat request.
+CONVERSATIONS: List[List[Dict[str, Any]]] = [
+    [
+        {
+            "user": "Hi, who is my landlord?",
+            "tool_call": None,
+            "reply": "Your landlord is listed in the property records.",
+        },
+        {
+            "user": "The kitchen sink in unit 1 is leaking, can someone fix it?",
+            "tool_call": {
+                "name": "create_issue_in_db",
+                "arguments": {
+                    "description": "Kitchen sink leaking",
+                    "location": "Kitchen",
+                    "action": "Send a plumber",
+                    "property_id": 1,
+                },
+            },
+            "reply": "I've logged the leak and a plumber will be in touch.",
+        },
+    ],
+    [
+        {
+            "user": "The heating in my bedroom stopped working.",
+            "tool_call": {
+                "name": "create_issue_in_db",
+                "arguments": {
+                    "description": "Heating not working",
+                    "location": "Bedroom",
+                    "action": "Send an HVAC technician",
+                    "property_id": 1,
+                },
+            },
+            "reply": "A heating issue has been created for your bedroom.",
+        },
+        {
+            "user": "Thanks, that's all.",
+            "tool_call": None,
+            "reply": "You're welcome!",
+        },
+    ],
+]
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token estimate (~4 characters per token for English text)."""
+    return max(1, len(text) // 4)
+
+
+class FakeOllama:
+    """Deterministic stand-in for the Ollama HTTP API.
+
+    Only ``/api/chat`` is implemented in any detail; replies are looked up by
+    the last human message in the request.
+    """
+
+    def __init__(self, turns: List[Dict[str, Any]], latency: float = 0.0):
+        self.turns = {turn["user"]: turn for turn in turns}
+        self.latency = latency
+        self.calls: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def reset(self):
+        with self._lock:
+            self.calls.clear()
+
+    def _respond(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        messages = body.get("messages", [])
+        prompt_text = "".join(m.get("content") or "" for m in messages)
+        user_message = next(
+            (m.get("content", "") for m in reversed(messages) if m.get("role") == "user"),
+            "",
+        )
+        turn = self.turns.get(user_message, {})
+        with_tools = bool(body.get("tools"))
+
+        with self._lock:
+            self.calls.append(
+                {
+                    "tools": with_tools,
+                    "messages": len(messages),
+                    "prompt_chars": len(prompt_text),
+                    "prompt_tokens": estimate_tokens(prompt_text),
+                }
+            )
+
+        message: Dict[str, Any] = {"role": "assistant", "content": ""}
+        if with_tools:
+            if turn.get("tool_call"):
+                message["tool_calls"] = [{"function": turn["tool_call"]}]
+        else:
+            message["content"] = turn.get("reply", "OK")
+
+        return {
+            "model": body.get("model", "llama3.1"),
+            "created_at": "2024-01-01T00:00:00Z",
+            "message": message,
+            "done": True,
+            "done_reason": "stop",
+            "prompt_eval_count": estimate_tokens(prompt_text),
+            "eval_count": estimate_tokens(message["content"]),
+        }
+
+    def _handler(self):
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):
+                pass
+
+            def _send(self, payload: bytes, content_type: str):
+                self.send_response(200)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def do_GET(self):
+                self._send(json.dumps({"models": []}).encode(), "application/json")
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length", 0))
+                body = json.loads(self.rfile.read(length) or b"{}")
+                if self.path != "/api/chat":
+                    self._send(b"{}", "application/json")
+                    return
+                if fake.latency:
+                    time.sleep(fake.latency)
+                result = fake._respond(body)
+                if body.get("stream", True):
+                    self._send(json.dumps(result).encode() + b"\n", "application/x-ndjson")
+                else:
+                    self._send(json.dumps(result).encode(), "application/json")
+
+        return Handler
+
+
+def seed(db, scale: int):
+    """Populate the database with ``scale`` properties/tenants and related rows."""
+    from models.tenant import Tenant
+    from models.landlord import Landlord
+    from models.property import Property
+    from models.issue import Issue
+    from models.contractor import Contractor
+
+    landlord_count = max(1, scale // 50)
+    db.add_all(
+        Landlord(
+            id=i,
+            name=f"Landlord {i}",
+            phone_number=f"555-01{i:04d}",
+            email=f"landlord{i}@example.com",
+        )
+        for i in range(1, landlord_count + 1)
+    )
+    db.add_all(
+        Property(
+            id=i,
+            address=f"{i} Main Street, Unit {i % 20 + 1}",
+            landlord_id=i % landlord_count + 1,
+        )
+        for i in range(1, scale + 1)
+    )
+    db.add_all(
+        Tenant(
+            name=f"Tenant {i}",
+            phone_number=f"555-02{i:04d}",
+            email=f"tenant{i}@example.com",
+            landlord_id=i % landlord_count + 1,
+            property_id=i,
+        )
+        for i in range(1, scale + 1)
+    )
+    db.add_all(
+        Contractor(
+            name=f"Contractor {i}",
+            phone_number=f"555-03{i:04d}",
+            email=f"contractor{i}@example.com",
+            work=json.dumps(["plumbing", "electrical"]),
+            landlord_id=i % landlord_count + 1,
+        )
+        for i in range(1, max(1, scale // 10) + 1)
+    )
+    db.add_all(
+        Issue(
+            description=f"Issue {i}",
+            location="Kitchen",
+            action="Inspect",
+            resolved=i % 3 == 0,
+            property_id=i % scale + 1,
+        )
+        for i in range(1, scale * 2 + 1)
+    )
+    db.commit()
+
+
+def run_scale(fake: FakeOllama, scale: int, repeat: int, tenant_id: Optional[int] = None) -> Dict[str, Any]:
+    from sqlalchemy import func, select
+
+    from database import SessionLocal, engine, init_db
+    from models.base import Base
+    from models.issue import Issue
+
+    Base.metadata.drop_all(bind=engine)
+    init_db()
+    with SessionLocal() as db:
+        seed(db, scale)
+
+    import ai
+
+    ai.reset_assistant()
+    started = time.perf_counter()
+    assistant = ai.get_assistant()
+    init_ms = (time.perf_counter() - started) * 1000
+
+    import tenant_context
+
+    context_ms = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        if tenant_id is None:
+            context = ai.load_all_data()
+        else:
+            tenant_context.clear()
+            context = tenant_context.get_tenant_context(tenant_id)["context"]
+        context_ms.append((time.perf_counter() - started) * 1000)
+
+    def count_issues() -> int:
+        with SessionLocal() as db:
+            return db.scalar(select(func.count()).select_from(Issue))
+
+    latencies = []
+    calls_per_turn = []
+    prompt_tokens = []
+    errors = 0
+    for _ in range(repeat):
+        for conversation in CONVERSATIONS:
+            for turn in conversation:
+                fake.reset()
+                issues_before = count_issues()
+                started = time.perf_counter()
+                reply = ai.send_message(turn["user"], tenant_id=tenant_id)
+                latencies.append((time.perf_counter() - started) * 1000)
+                # A failed tool call still gets a normal reply, so check the
+                # issue was actually created rather than trusting the text
+                expected = 1 if turn["tool_call"] else 0
+                if reply.startswith("Error:") or count_issues() - issues_before != expected:
+                    errors += 1
+                calls_per_turn.append(len(fake.calls))
+                prompt_tokens.append(sum(c["prompt_tokens"] for c in fake.calls))
+
+    return {
+        "scale": scale,
+        "init_ms": round(init_ms, 2),
+        "context_build_ms": round(statistics.median(context_ms), 2),
+        "context_tokens": estimate_tokens(context),
+        "llm_calls_per_turn": round(statistics.mean(calls_per_turn), 2),
+        "prompt_tokens_per_turn": round(statistics.mean(prompt_tokens)),
+        "latency_p50_ms": round(statistics.median(latencies), 2),
+        "latency_max_ms": round(max(latencies), 2),
+        "errors": errors,
+    }
+
+
+def print_table(results: List[Dict[str, Any]]):
+    columns = list(results[0].keys())
+    widths = [max(len(c), *(len(str(r[c])) for r in results)) for c in columns]
+    print("  ".join(c.rjust(w) for c, w in zip(columns, widths)))
+    for row in results:
+        print("  ".join(str(row[c]).rjust(w) for c, w in zip(columns, widths)))
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scales", default="10,100,1000", help="comma separated row counts")
+    parser.add_argument("--repeat", type=int, default=3, help="replays per scale")
+    parser.add_argument("--llm-latency", type=float, default=0.0, help="simulated seconds per LLM call")
+    parser.add_argument("--tenant-id", type=int, help="replay in tenant-scoped mode for this tenant")
+    parser.add_argument("--json", dest="json_path", help="also write results to this file")
+    args = parser.parse_args(argv)
+
+    turns = [turn for conversation in CONVERSATIONS for turn in conversation]
+    fake = FakeOllama(turns, latency=args.llm_latency).start()
+
+    # Must be set before database/ai are imported.
+    workdir = tempfile.mkdtemp(prefix="bench_ai_")
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(workdir, 'bench.db')}"
+    os.environ["OLLAMA_BASE_URL"] = fake.base_url
+
+    try:
+        results = [
+            run_scale(fake, int(scale), args.repeat, args.tenant_id) for scale in args.scales.split(",")
+        ]
+    finally:
+        fake.stop()
+
+    print_table(results)
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,97 @@
+"""Micro-benchmark for the model CRUD paths used by the API endpoints.
+
+Seeds a throwaway SQLite database and times ``get``, ``get_all``,
+``create`` and ``update`` per call, through the model classes directly
+(``--layer model``) or through the FastAPI app (``--layer http``).
+
+Usage (from the backend directory):
+
+    python bench_api.py --rows 1000 --calls 2000
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+from typing import Callable, List, Optional
+
+
+def timed(fn: Callable[[int], object], calls: int) -> float:
+    """Median microseconds per call over five batches."""
+    batches = []
+    per_batch = max(1, calls // 5)
+    for batch in range(5):
+        started = time.perf_counter()
+        for i in range(per_batch):
+            fn(batch * per_batch + i)
+        batches.append((time.perf_counter() - started) / per_batch * 1e6)
+    return statistics.median(batches)
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1000, help="rows per table")
+    parser.add_argument("--calls", type=int, default=2000, help="calls per operation")
+    parser.add_argument("--layer", choices=["model", "http"], default="model")
+    args = parser.parse_args(argv)
+
+    # Must be set before database is imported.
+    workdir = tempfile.mkdtemp(prefix="bench_api_")
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(workdir, 'bench.db')}"
+
+    from database import SessionLocal, init_db
+    from models.landlord import Landlord
+    from models.property import Property
+
+    init_db()
+    with SessionLocal() as db:
+        db.add(Landlord(id=1, name="Landlord", phone_number="555", email="l@example.com"))
+        db.add_all(
+            Property(id=i, address=f"{i} Main Street", landlord_id=1)
+            for i in range(1, args.rows + 1)
+        )
+        db.commit()
+
+    rows = args.rows
+    results = {}
+    if args.layer == "model":
+        db = SessionLocal()
+        results["get"] = timed(lambda i: Property.get(db, i % rows + 1), args.calls)
+        results["get_all"] = timed(lambda i: Property.get_all(db, 0, 100), args.calls)
+        results["update"] = timed(
+            lambda i: Property.update(db, i % rows + 1, {"address": f"{i} Side Street"}),
+            args.calls,
+        )
+        results["create"] = timed(
+            lambda i: Property.create(db, {"address": f"{i} New Street", "landlord_id": 1}),
+            args.calls,
+        )
+        db.close()
+    else:
+        from fastapi.testclient import TestClient
+        import api
+
+        with TestClient(api.app) as client:
+            results["get"] = timed(lambda i: client.get(f"/properties/{i % rows + 1}"), args.calls)
+            results["get_all"] = timed(lambda i: client.get("/properties/"), args.calls)
+            results["update"] = timed(
+                lambda i: client.put(
+                    f"/properties/{i % rows + 1}", params={"address": f"{i} Side Street"}
+                ),
+                args.calls,
+            )
+            results["create"] = timed(
+                lambda i: client.post(
+                    "/properties/", params={"address": f"{i} New Street", "landlord_id": 1}
+                ),
+                args.calls,
+            )
+
+    for name, us in results.items():
+        print(f"{name:>8}  {us:10.1f} us/call")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,188 @@
+"""Persistent assistant conversations.
+
+Chat history is kept in the database (through ``database.SessionLocal``)
+instead of process memory, so it survives restarts and an idle conversation
+holds no memory at all: a ``ConversationHistory`` is just its key. Each turn
+is appended with one INSERT, resuming reads only the newest
+``CONVERSATION_WINDOW`` messages, and once ``CONVERSATION_SUMMARY_BATCH``
+messages have scrolled out of the window they are folded into a short stored
+summary and deleted, so neither storage nor resume cost grows with the
+length of the thread.
+"""
+
+import os
+import threading
+from typing import List, Optional, Sequence
+
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.exc import IntegrityError
+
+from database import SessionLocal, engine
+from models.conversation import Conversation, ConversationMessage
+
+CONVERSATION_WINDOW = int(os.getenv("CONVERSATION_WINDOW", "20"))
+CONVERSATION_SUMMARY_BATCH = int(os.getenv("CONVERSATION_SUMMARY_BATCH", "20"))
+CONVERSATION_SUMMARY_CHARS = int(os.getenv("CONVERSATION_SUMMARY_CHARS", "2000"))
+
+GLOBAL_CONVERSATION = "global"
+
+# Each message contributes at most one line of this length to the summary
+SUMMARY_LINE_CHARS = 200
+_SPEAKERS = {"human": "User", "ai": "Assistant"}
+
+_tables_lock = threading.Lock()
+_tables_ready = False
+
+
+def _ensure_tables():
+    """Create the conversation tables on first use, for databases created before they existed."""
+    global _tables_ready
+    if not _tables_ready:
+        with _tables_lock:
+            if not _tables_ready:
+                Conversation.__table__.create(bind=engine, checkfirst=True)
+                ConversationMessage.__table__.create(bind=engine, checkfirst=True)
+                _tables_ready = True
+
+
+def _to_message(role: str, content: str):
+    from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
+
+    return {"human": HumanMessage, "ai": AIMessage, "system": SystemMessage}[role](
+        content=content
+    )
+
+
+def summarize(summary: Optional[str], messages) -> str:
+    """Fold ``(role, content)`` messages into ``summary``.
+
+    Each message becomes one clipped line; the oldest lines are dropped once
+    the summary exceeds ``CONVERSATION_SUMMARY_CHARS``.
+    """
+    lines = summary.splitlines() if summary else []
+    for role, content in messages:
+        if role not in _SPEAKERS:
+            continue
+        text = " ".join(content.split())
+        if len(text) > SUMMARY_LINE_CHARS:
+            text = text[: SUMMARY_LINE_CHARS - 3] + "..."
+        lines.append(f"{_SPEAKERS[role]}: {text}")
+    size = sum(len(line) + 1 for line in lines)
+    while lines and size > CONVERSATION_SUMMARY_CHARS:
+        size -= len(lines.pop(0)) + 1
+    return "\n".join(lines)
+
+
+class ConversationHistory:
+    """One conversation's history, read from and written to the database on demand.
+
+    Offers the ``messages`` / ``add_message`` / ``add_messages`` / ``clear``
+    interface of langchain's chat message histories.
+    """
+
+    __slots__ = ("key", "tenant_id")
+
+    def __init__(self, key: str, tenant_id: Optional[int] = None):
+        self.key = key
+        self.tenant_id = tenant_id
+
+    def __repr__(self):
+        return f"<ConversationHistory(key='{self.key}')>"
+
+    @property
+    def messages(self) -> List:
+        """The stored summary (as a system message) followed by the most recent window."""
+        _ensure_tables()
+        with SessionLocal() as db:
+            conversation = db.execute(
+                select(Conversation.id, Conversation.summary).where(Conversation.key == self.key)
+            ).first()
+            if conversation is None:
+                return []
+            rows = db.execute(
+                select(ConversationMessage.role, ConversationMessage.content)
+                .where(ConversationMessage.conversation_id == conversation.id)
+                .order_by(ConversationMessage.id.desc())
+                .limit(CONVERSATION_WINDOW)
+            ).all()
+
+        messages = [_to_message(row.role, row.content) for row in reversed(rows)]
+        if conversation.summary:
+            messages.insert(
+                0, _to_message("system", f"Summary of the earlier conversation:\n{conversation.summary}")
+            )
+        return messages
+
+    def add_message(self, message):
+        self.add_messages([message])
+
+    def add_messages(self, messages: Sequence):
+        """Append ``messages`` in a single INSERT, then fold old turns into the summary if due."""
+        rows = [{"role": m.type, "content": str(m.content)} for m in messages]
+        if not rows:
+            return
+        _ensure_tables()
+        with SessionLocal() as db:
+            conversation_id = self._conversation_id(db)
+            db.execute(
+                insert(ConversationMessage),
+                [{"conversation_id": conversation_id, **row} for row in rows],
+            )
+            db.commit()
+            self._compact(db, conversation_id)
+
+    def clear(self):
+        _ensure_tables()
+        with SessionLocal() as db:
+            ids = select(Conversation.id).where(Conversation.key == self.key)
+            db.execute(delete(ConversationMessage).where(ConversationMessage.conversation_id.in_(ids)))
+            db.execute(delete(Conversation).where(Conversation.key == self.key))
+            db.commit()
+
+    def _conversation_id(self, db) -> int:
+        stmt = select(Conversation.id).where(Conversation.key == self.key)
+        conversation_id = db.scalar(stmt)
+        if conversation_id is None:
+            try:
+                conversation_id = db.execute(
+                    insert(Conversation)
+                    .values(key=self.key, tenant_id=self.tenant_id)
+                    .returning(Conversation.id)
+                ).scalar_one()
+            except IntegrityError:
+                # Created concurrently by another writer
+                db.rollback()
+                conversation_id = db.scalar(stmt)
+        return conversation_id
+
+    def _compact(self, db, conversation_id: int):
+        overflow = db.execute(
+            select(ConversationMessage.id, ConversationMessage.role, ConversationMessage.content)
+            .where(ConversationMessage.conversation_id == conversation_id)
+            .order_by(ConversationMessage.id.desc())
+            .offset(CONVERSATION_WINDOW)
+        ).all()
+        if len(overflow) < CONVERSATION_SUMMARY_BATCH:
+            return
+
+        ids = [row.id for row in overflow]
+        deleted = db.execute(delete(ConversationMessage).where(ConversationMessage.id.in_(ids)))
+        if deleted.rowcount != len(ids):
+            # Another writer folded some of these first
+            db.rollback()
+            return
+        # Read the summary after the delete so it's current under the write lock
+        summary = db.scalar(select(Conversation.summary).where(Conversation.id == conversation_id))
+        db.execute(
+            update(Conversation)
+            .where(Conversation.id == conversation_id)
+            .values(summary=summarize(summary, [(r.role, r.content) for r in reversed(overflow)]))
+        )
+        db.commit()
+
+
+def get_history(tenant_id: Optional[int] = None) -> ConversationHistory:
+    """The global conversation, or a tenant's own conversation."""
+    if tenant_id is None:
+        return ConversationHistory(GLOBAL_CONVERSATION)
+    return ConversationHistory(f"tenant:{tenant_id}", tenant_id=tenant_id)
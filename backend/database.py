@@ -1,8 +1,125 @@
-from sqlalchemy import create_engine
+import logging
+import os
+from datetime import datetime
+
+from sqlalchemy import create_engine, inspect, text
 from sqlalchemy.orm import sessionmaker
 
-SQLALCHEMY_DATABASE_URL = "sqlite:///./test.db"  # Update this URL as needed
+logger = logging.getLogger(__name__)
+
+SQLALCHEMY_DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./test.db")  # Update this URL as needed
 
 engine = create_engine(SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False})
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+def init_db():
+    """Create missing tables, migrate older ones and seed derived counters.
+
+    Run before anything writes: the write hooks of the models maintain the
+    change log, analytics and counters, so their tables have to exist. Used
+    by the API's startup, the assistant and the benchmarks; safe to repeat.
+    """
+    # Every model (and with it every write hook's table) must be registered
+    import models.address_index, models.archived_issue, models.change, models.contractor  # noqa: F401
+    import models.conversation, models.issue, models.landlord, models.property  # noqa: F401
+    import models.row_count, models.tenant  # noqa: F401
+    from models.base import Base
+    from models.issue_stats import seed_open_counts
+
+    Base.metadata.create_all(bind=engine)
+    migrate_issue_columns()
+    migrate_issue_autoincrement()
+    migrate_address_index()
+    with SessionLocal() as db:
+        # Before anything writes, so no issue write applies a delta to unseeded counts
+        if seed_open_counts(db):
+            logger.info("Seeded open issue counts from existing issues")
+
+
+def migrate_issue_columns():
+    """Add the issue lifecycle columns to an ``issues`` table created before them.
+
+    ``create_all`` only creates missing tables. Issues already resolved get
+    ``resolved_at`` set to the migration time so the archive job can age them.
+    Safe to run on every startup.
+    """
+    from models.issue import Issue
+
+    table = Issue.__table__
+    existing = {column["name"] for column in inspect(engine).get_columns(table.name)}
+    now = datetime.utcnow()
+    with engine.begin() as connection:
+        for name in ("created_at", "resolved_at"):
+            if name in existing:
+                continue
+            column = table.c[name]
+            ddl = f"ALTER TABLE {table.name} ADD COLUMN {name} {column.type.compile(engine.dialect)}"
+            if not column.nullable:
+                # ADD COLUMN needs a constant default for a NOT NULL column
+                ddl += f" NOT NULL DEFAULT '{now:%Y-%m-%d %H:%M:%S.%f}'"
+            connection.execute(text(ddl))
+            logger.info("Added issues.%s", name)
+            if name == "resolved_at":
+                connection.execute(
+                    table.update()
+                    .where(table.c.resolved.is_(True), table.c.resolved_at.is_(None))
+                    .values(resolved_at=now)
+                )
+        for index in table.indexes:
+            index.create(connection, checkfirst=True)
+
+
+def migrate_issue_autoincrement():
+    """Rebuild an SQLite ``issues`` table created without AUTOINCREMENT.
+
+    Without it SQLite gives the id of the newest deleted or archived issue to
+    the next new one. The rebuilt table's sequence starts above every live and
+    archived id. Does nothing on other databases or once the table has it.
+    """
+    from models.archived_issue import ArchivedIssue
+    from models.issue import Issue
+
+    if engine.dialect.name != "sqlite":
+        return
+    table = Issue.__table__
+    legacy = f"{table.name}_legacy"
+    with engine.begin() as connection:
+        ddl = connection.scalar(
+            text("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = :name"),
+            {"name": table.name},
+        )
+        if "AUTOINCREMENT" in ddl.upper():
+            return
+        # pysqlite runs DDL outside transactions; a savepoint makes the rebuild atomic
+        with connection.begin_nested():
+            connection.execute(text(f"ALTER TABLE {table.name} RENAME TO {legacy}"))
+            for index in table.indexes:
+                connection.execute(text(f"DROP INDEX IF EXISTS {index.name}"))
+            table.create(connection)
+            columns = ", ".join(column.name for column in table.columns)
+            connection.execute(
+                text(f"INSERT INTO {table.name} ({columns}) SELECT {columns} FROM {legacy}")
+            )
+            connection.execute(text(f"DROP TABLE {legacy}"))
+            connection.execute(text("DELETE FROM sqlite_sequence WHERE name = :name"), {"name": table.name})
+            connection.execute(
+                text(
+                    "INSERT INTO sqlite_sequence (name, seq) SELECT :name, max("
+                    f"(SELECT coalesce(max(id), 0) FROM {table.name}), "
+                    f"(SELECT coalesce(max(id), 0) FROM {ArchivedIssue.__tablename__}))"
+                ),
+                {"name": table.name},
+            )
+    logger.info("Rebuilt %s with AUTOINCREMENT", table.name)
+
+
+def migrate_address_index():
+    """Replace the trigram table's property_id index with the covering one it grew into."""
+    from models.address_index import AddressTrigram
+
+    with engine.begin() as connection:
+        for index in AddressTrigram.__table__.indexes:
+            index.create(connection, checkfirst=True)
+        connection.execute(text("DROP INDEX IF EXISTS ix_address_trigrams_property"))
@@ -0,0 +1,238 @@
+"""Local intent and slot extraction for tenant fault reports.
+
+Plain reports such as "the kitchen sink in unit 4 is leaking, needs a
+plumber" are recognized without an LLM call: a small naive Bayes classifier
+scores the message, and keyword rules fill the ``create_issue_in_db``
+arguments (description, location, action, property_id). Only messages that
+are confidently reports *and* have every required slot filled take the fast
+path, and the message must also name a fault ("leaking", "broken", "no
+heat"); everything else is left to the LLM.
+"""
+
+import math
+import os
+import re
+from collections import Counter
+from typing import Any, Dict, List, Optional, Tuple
+
+FAST_PATH_THRESHOLD = float(os.getenv("AI_FAST_PATH_THRESHOLD", "0.9"))
+
+# Rooms and areas, most specific first
+LOCATIONS = [
+    ("living room", "Living room"),
+    ("dining room", "Dining room"),
+    ("laundry room", "Laundry room"),
+    ("kitchen", "Kitchen"),
+    ("bathroom", "Bathroom"),
+    ("washroom", "Bathroom"),
+    ("toilet", "Bathroom"),
+    ("shower", "Bathroom"),
+    ("bedroom", "Bedroom"),
+    ("basement", "Basement"),
+    ("garage", "Garage"),
+    ("hallway", "Hallway"),
+    ("balcony", "Balcony"),
+    ("attic", "Attic"),
+    ("laundry", "Laundry room"),
+    ("roof", "Roof"),
+    ("yard", "Yard"),
+    ("front door", "Entrance"),
+    ("entrance", "Entrance"),
+    ("stairs", "Stairs"),
+]
+
+# Trade keywords and the action each one implies
+ACTIONS = [
+    (("plumber", "leak", "leaking", "drip", "dripping", "clog", "clogged", "sink", "toilet", "pipe", "drain", "faucet", "tap", "flood", "water heater"), "Send a plumber"),
+    (("electrician", "outlet", "socket", "breaker", "wiring", "spark", "sparks", "sparking", "power", "light", "lights", "switch"), "Send an electrician"),
+    (("hvac", "heating", "heater", "furnace", "radiator", "air conditioning", "ac", "thermostat", "no heat", "cold"), "Send an HVAC technician"),
+    (("fridge", "refrigerator", "stove", "oven", "dishwasher", "washer", "dryer", "microwave", "appliance"), "Send an appliance repair technician"),
+    (("pest", "mice", "mouse", "rats", "cockroach", "cockroaches", "bugs", "bedbugs", "ants"), "Send pest control"),
+    (("lock", "locked", "key", "door", "window", "broken"), "Send a handyman"),
+    (("mold", "mould", "damp"), "Send a mold inspector"),
+]
+
+# What is wrong: a report has to name a fault, not just a room and a fixture
+FAULTS = (
+    "leak", "leaks", "leaking", "leaky", "drip", "drips", "dripping", "clogged", "blocked",
+    "backed up", "overflowing", "flooded", "flooding", "burst", "broken", "broke", "cracked",
+    "damaged", "stuck", "jammed", "loose", "stopped", "no heat", "no hot water", "no power",
+    "no water", "cold", "spark", "sparks", "sparking", "smoke", "smoking", "smells", "mold",
+    "mould", "damp", "mice", "mouse", "rats", "cockroach", "cockroaches", "bugs", "bedbugs",
+    "ants", "pests", "infestation", "noise", "noisy", "tripped", "out of order",
+)
+_FAULT = re.compile(r"\b(" + "|".join(re.escape(fault) for fault in FAULTS) + r")\b")
+
+# Messages that look like reports but are questions, follow-ups or negations
+_NOT_A_REPORT = re.compile(
+    r"\?|\b(how|what|when|why|who|can you|could you|status|update on|"
+    r"no longer|not anymore|fixed|resolved|cancel|already reported)\b"
+)
+# Negated, past-tense or "works again" messages. Some real reports match too
+# ("the heating is not working"); those are left to the LLM rather than risk
+# filing an issue for something that isn't broken.
+_NEGATED_OR_PAST = re.compile(
+    r"n't\b|\b(not|no longer|anymore|again|was|were)\b|(?<!stopped )\bworking\b"
+)
+_PROPERTY_ID = re.compile(r"\bproperty\s*(?:id\s*)?#?\s*(\d+)\b")
+_WORD = re.compile(r"[a-z']+")
+
+# Seed training data for the classifier: (text, is_report)
+TRAINING_EXAMPLES: List[Tuple[str, bool]] = [
+    ("the kitchen sink is leaking", True),
+    ("my toilet is clogged and overflowing", True),
+    ("there is no heat in the bedroom", True),
+    ("the heating stopped working", True),
+    ("water is dripping from the bathroom ceiling", True),
+    ("the outlet in the living room is sparking", True),
+    ("the fridge stopped cooling", True),
+    ("the lights in the hallway are not working", True),
+    ("we have mice in the kitchen", True),
+    ("the front door lock is broken", True),
+    ("the dishwasher is leaking water on the floor", True),
+    ("the shower drain is blocked", True),
+    ("there's mold in the bathroom", True),
+    ("the furnace is making a loud noise and not heating", True),
+    ("the bedroom window is broken", True),
+    ("the pipe under the sink burst", True),
+    ("my stove burner won't turn on", True),
+    ("the air conditioning is not working", True),
+    # Affirmative counterparts of the negated examples below, so the negatives
+    # weigh on the negation words rather than on "sink" or "kitchen"
+    ("the kitchen sink is leaking", True),
+    ("the kitchen sink is leaking, needs a plumber", True),
+    ("the kitchen light is broken", True),
+    ("there is a leak in the bathroom", True),
+    ("the heating is broken", True),
+    ("the toilet leaks", True),
+    ("the bedroom window is broken and won't close", True),
+    ("there are mice in the kitchen", True),
+    ("the kitchen faucet is dripping", True),
+    ("the bathroom sink is clogged", True),
+    ("my kitchen sink is leaking", True),
+    ("my toilet is clogged", True),
+    ("my bedroom window is broken", True),
+    ("my heating stopped working", True),
+    ("my bathroom sink is leaking", True),
+    ("my kitchen faucet is dripping", True),
+    ("we have mice in the bedroom", True),
+    ("we have cockroaches in the kitchen", True),
+    ("there is no heat in my apartment", True),
+    ("there is no hot water in the bathroom of property 2", True),
+    ("the toilet in unit 3 is clogged", True),
+    ("my shower drain is clogged", True),
+    ("the garage door is stuck", True),
+    ("the ceiling in my bedroom is leaking", True),
+    ("hi how are you", False),
+    ("who is my landlord", False),
+    ("what is the status of my issue", False),
+    ("when is rent due", False),
+    ("thanks for your help", False),
+    ("can you tell me the landlord's phone number", False),
+    ("what contractors do you have", False),
+    ("hello", False),
+    ("is the plumber coming today", False),
+    ("the leak was fixed, thank you", False),
+    ("how do i pay rent", False),
+    ("i would like to renew my lease", False),
+    ("what's the address of my property", False),
+    ("goodbye", False),
+    ("the kitchen sink isn't leaking anymore", False),
+    ("the kitchen sink is not leaking", False),
+    ("the kitchen light is working again", False),
+    ("there was a leak in the bathroom last year", False),
+    ("the heating was broken but it works now", False),
+    ("the toilet doesn't leak", False),
+    ("the bedroom window is no longer broken", False),
+    ("there were mice in the kitchen before we moved in", False),
+    # Fixtures and rooms mentioned without a fault
+    ("the new kitchen faucet looks great", False),
+    ("the plumber did a great job on the sink", False),
+    ("the bathroom is nice and clean", False),
+    ("my kitchen sink works fine", False),
+    ("i love the new dishwasher", False),
+    ("the heating is fine thanks", False),
+    ("the toilet is good now, thanks to the repair", False),
+    ("the bedroom is too small for my desk", False),
+    ("rent for the kitchen upgrade is too expensive", False),
+    ("the electrician came and the lights are good", False),
+]
+
+
+def _words(text: str) -> List[str]:
+    return _WORD.findall(text.lower())
+
+
+class NaiveBayesIntent:
+    """Two-class multinomial naive Bayes with Laplace smoothing."""
+
+    def __init__(self, examples: List[Tuple[str, bool]]):
+        self.counts = {True: Counter(), False: Counter()}
+        docs = Counter()
+        for text, label in examples:
+            self.counts[label].update(_words(text))
+            docs[label] += 1
+        self.vocabulary = set(self.counts[True]) | set(self.counts[False])
+        self.totals = {label: sum(c.values()) for label, c in self.counts.items()}
+        self.priors = {label: math.log(docs[label] / len(examples)) for label in (True, False)}
+
+    def probability(self, text: str) -> float:
+        """Probability that ``text`` is a fault report."""
+        scores = {}
+        size = len(self.vocabulary)
+        for label in (True, False):
+            score = self.priors[label]
+            for word in _words(text):
+                if word in self.vocabulary:
+                    score += math.log((self.counts[label][word] + 1) / (self.totals[label] + size))
+            scores[label] = score
+        top = max(scores.values())
+        exp = {label: math.exp(score - top) for label, score in scores.items()}
+        return exp[True] / (exp[True] + exp[False])
+
+
+_classifier = NaiveBayesIntent(TRAINING_EXAMPLES)
+
+
+def _find_location(text: str) -> Optional[str]:
+    for keyword, location in LOCATIONS:
+        if re.search(rf"\b{keyword}\b", text):
+            return location
+    return None
+
+
+def _find_action(text: str) -> Optional[str]:
+    for keywords, action in ACTIONS:
+        if any(re.search(rf"\b{keyword}\b", text) for keyword in keywords):
+            return action
+    return None
+
+
+def extract_issue(message: str) -> Optional[Dict[str, Any]]:
+    """Return ``create_issue_in_db`` arguments plus ``confidence`` for a clear fault report.
+
+    Returns None when the message is not confidently a report or a required
+    slot could not be filled, in which case the caller should use the LLM.
+    """
+    text = message.strip().lower().replace("\u2019", "'")
+    if not text or _NOT_A_REPORT.search(text) or _NEGATED_OR_PAST.search(text):
+        return None
+
+    confidence = _classifier.probability(text)
+    if confidence < FAST_PATH_THRESHOLD:
+        return None
+
+    location = _find_location(text)
+    action = _find_action(text)
+    if location is None or action is None or not _FAULT.search(text):
+        return None
+
+    property_match = _PROPERTY_ID.search(text)
+    description = message.strip().rstrip(".!")
+    return {
+        "description": description[0].upper() + description[1:],
+        "location": location,
+        "action": action,
+        "property_id": int(property_match.group(1)) if property_match else None,
+        "confidence": round(confidence, 3),
+    }
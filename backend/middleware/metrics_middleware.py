@@ -0,0 +1,178 @@
+import time
+from bisect import bisect_left
+from collections import defaultdict
+
+from fastapi import FastAPI
+from starlette.responses import Response
+
+# Latency buckets in seconds and response size buckets in bytes
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (100, 1_000, 10_000, 100_000, 1_000_000, 10_000_000)
+
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+class Histogram:
+    """Fixed-bucket histogram; counts are stored per bucket and summed on export."""
+
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class MetricsRegistry:
+    """In-process request metrics, labelled by method and route template.
+
+    All updates happen on the event loop thread, so no locking is needed.
+    """
+
+    def __init__(self):
+        self.requests = defaultdict(int)  # (method, route, status) -> count
+        self.in_flight = defaultdict(int)  # (method, route) -> gauge
+        self.latency = {}  # (method, route) -> Histogram
+        self.response_size = {}  # (method, route) -> Histogram
+
+    def start(self, key):
+        self.in_flight[key] += 1
+
+    def finish(self, key, status, duration, size):
+        self.in_flight[key] -= 1
+        self.requests[key + (status,)] += 1
+
+        latency = self.latency.get(key)
+        if latency is None:
+            latency = self.latency[key] = Histogram(LATENCY_BUCKETS)
+        latency.observe(duration)
+
+        response_size = self.response_size.get(key)
+        if response_size is None:
+            response_size = self.response_size[key] = Histogram(SIZE_BUCKETS)
+        response_size.observe(size)
+
+    def render(self):
+        """Render all metrics in the Prometheus text exposition format."""
+        lines = [
+            "# HELP http_requests_total Total HTTP requests by route and status code.",
+            "# TYPE http_requests_total counter",
+        ]
+        for (method, route, status), value in sorted(self.requests.items()):
+            lines.append(
+                f'http_requests_total{{method="{method}",route="{route}",status="{status}"}} {value}'
+            )
+
+        lines += [
+            "# HELP http_requests_in_flight HTTP requests currently being served.",
+            "# TYPE http_requests_in_flight gauge",
+        ]
+        for (method, route), value in sorted(self.in_flight.items()):
+            lines.append(f'http_requests_in_flight{{method="{method}",route="{route}"}} {value}')
+
+        self._render_histogram(
+            lines,
+            "http_request_duration_seconds",
+            "HTTP request latency in seconds.",
+            self.latency,
+        )
+        self._render_histogram(
+            lines,
+            "http_response_size_bytes",
+            "HTTP response body size in bytes.",
+            self.response_size,
+        )
+        return "\n".join(lines) + "\n"
+
+    @staticmethod
+    def _render_histogram(lines, name, help_text, histograms):
+        lines += [f"# HELP {name} {help_text}", f"# TYPE {name} histogram"]
+        for (method, route), hist in sorted(histograms.items()):
+            labels = f'method="{method}",route="{route}"'
+            cumulative = 0
+            for bound, count in zip(hist.buckets, hist.counts):
+                cumulative += count
+                lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+            lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {hist.count}')
+            lines.append(f"{name}_sum{{{labels}}} {hist.sum}")
+            lines.append(f"{name}_count{{{labels}}} {hist.count}")
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware recording per-route latency, status, size and in-flight counts."""
+
+    def __init__(self, app, registry: MetricsRegistry, routes):
+        self.app = app
+        self.registry = registry
+        self.routes = routes
+        self._table = []
+
+    def route_template(self, scope):
+        # Resolve the route template up front so the in-flight gauge can be
+        # labelled; unmatched paths share one label to keep cardinality bounded.
+        # Only the compiled path regexes are checked, which is much cheaper
+        # than the full Route.matches() used by the router.
+        if len(self._table) != len(self.routes):
+            self._table = [
+                (route.path_regex.match, getattr(route, "methods", None), route.path)
+                for route in self.routes
+                if hasattr(route, "path_regex")
+            ]
+        path = scope["path"]
+        method = scope["method"]
+        partial = None
+        for match, methods, template in self._table:
+            if match(path):
+                if methods is None or method in methods:
+                    return template
+                if partial is None:
+                    partial = template
+        return partial or UNMATCHED_ROUTE
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        key = (scope["method"], self.route_template(scope))
+        status = 500
+        size = 0
+
+        async def send_wrapper(message):
+            nonlocal status, size
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body":
+                size += len(message.get("body", b""))
+            await send(message)
+
+        registry = self.registry
+        registry.start(key)
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            registry.finish(key, status, time.perf_counter() - started, size)
+
+
+def setup_metrics(app: FastAPI, path: str = "/metrics"):
+    """Record request metrics and expose them in Prometheus format at ``path``"""
+
+    registry = MetricsRegistry()
+
+    async def metrics(request):
+        return Response(
+            registry.render(),
+            media_type="text/plain; version=0.0.4; charset=utf-8",
+        )
+
+    app.add_route(path, metrics, include_in_schema=False)
+    app.add_middleware(MetricsMiddleware, registry=registry, routes=app.router.routes)
+    app.state.metrics = registry
+    return registry
@@ -0,0 +1,134 @@
+import logging
+import os
+import time
+from collections import Counter
+from contextvars import ContextVar
+
+from fastapi import FastAPI
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+# Statements slower than this are logged with their parameters
+SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", "100"))
+# The same statement shape repeated this many times in one request is flagged as N+1
+N_PLUS_ONE_THRESHOLD = int(os.getenv("N_PLUS_ONE_THRESHOLD", "5"))
+
+
+class QueryStats:
+    """SQL statements issued while serving a single request."""
+
+    __slots__ = ("count", "total", "shapes")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.shapes = Counter()
+
+    def record(self, statement, duration, executemany=False):
+        self.count += 1
+        self.total += duration
+        # A batched write (including each batch SQLAlchemy splits it into) is
+        # one statement for many rows, the opposite of an N+1
+        if not executemany:
+            self.shapes[statement] += 1
+
+    def repeated(self, threshold=N_PLUS_ONE_THRESHOLD):
+        return [(s, n) for s, n in self.shapes.items() if n >= threshold]
+
+
+# Sync endpoints run in a copied context, so they share the request's QueryStats
+current_stats: ContextVar = ContextVar("sql_query_stats", default=None)
+
+
+def run_untracked(fn, *args):
+    """Call ``fn`` without attributing its queries to the current request.
+
+    For polling loops, whose one repeated query would otherwise be reported
+    as an N+1.
+    """
+    token = current_stats.set(None)
+    try:
+        return fn(*args)
+    finally:
+        current_stats.reset(token)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    duration = time.perf_counter() - conn.info["query_start"].pop()
+
+    stats = current_stats.get()
+    if stats is not None:
+        stats.record(statement, duration, executemany)
+
+    if duration * 1000 >= SLOW_QUERY_MS:
+        logger.warning(
+            "Slow query (%.1f ms): %.500s | parameters=%.500r",
+            duration * 1000,
+            statement,
+            parameters,
+        )
+
+
+def _handle_error(exception_context):
+    # A failed statement never reaches after_cursor_execute; drop its start time
+    conn = exception_context.connection
+    starts = conn.info.get("query_start") if conn is not None else None
+    if starts:
+        starts.pop()
+
+
+def instrument_engine(engine: Engine):
+    """Time every statement on ``engine``, attributing it to the current request."""
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+        event.listen(engine, "handle_error", _handle_error)
+
+
+class SQLTimingMiddleware:
+    """Collect per-request SQL stats and report them in a ``Server-Timing`` header."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats()
+        token = current_stats.set(stats)
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                timing = f'db;dur={stats.total * 1000:.2f};desc="{stats.count} queries"'
+                message["headers"] = list(message.get("headers", [])) + [
+                    (b"server-timing", timing.encode("latin-1"))
+                ]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            current_stats.reset(token)
+            for statement, count in stats.repeated():
+                logger.warning(
+                    "Possible N+1 on %s %s: statement ran %d times: %.500s",
+                    scope["method"],
+                    scope["path"],
+                    count,
+                    statement,
+                )
+
+
+def setup_sql_instrumentation(app: FastAPI, engine: Engine):
+    """Instrument ``engine`` and attribute its queries to the requests served by ``app``"""
+
+    instrument_engine(engine)
+    app.add_middleware(SQLTimingMiddleware)
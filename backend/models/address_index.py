@@ -0,0 +1,268 @@
+import re
+import unicodedata
+from collections import defaultdict
+
+from sqlalchemy import Column, Index, Integer, String, delete, event, func, insert, select, union_all
+from sqlalchemy.orm import Session, aliased
+
+from models.base import Base, on_bulk_write
+from models.property import Property
+
+# Common street abbreviations, expanded so "Main St" and "main street" index alike
+ABBREVIATIONS = {
+    "st": "street",
+    "str": "street",
+    "ave": "avenue",
+    "av": "avenue",
+    "rd": "road",
+    "dr": "drive",
+    "blvd": "boulevard",
+    "ln": "lane",
+    "ct": "court",
+    "pl": "place",
+    "hwy": "highway",
+    "pkwy": "parkway",
+    "apt": "unit",
+    "ste": "suite",
+    "n": "north",
+    "s": "south",
+    "e": "east",
+    "w": "west",
+}
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+# Bounds on the typo fallback (see _trigram_matches)
+TRIGRAM_MIN_LENGTH = 3
+TRIGRAM_PROBES = 2
+TRIGRAM_CANDIDATES = 100
+
+
+def normalize_tokens(text: str, expand_last: bool = True):
+    """Lowercase, strip accents and punctuation, and expand street abbreviations."""
+    text = unicodedata.normalize("NFKD", text).encode("ascii", "ignore").decode()
+    tokens = _TOKEN_RE.findall(text.lower())
+    last = len(tokens) - 1
+    return [
+        ABBREVIATIONS.get(token, token) if expand_last or i != last else token
+        for i, token in enumerate(tokens)
+    ]
+
+
+def trigrams(token: str):
+    padded = f"  {token} "
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+class AddressToken(Base):
+    """Normalized address tokens per property, for prefix lookups."""
+
+    __tablename__ = "property_address_tokens"
+    __track_changes__ = False
+
+    id = Column(Integer, primary_key=True)
+    token = Column(String, nullable=False)
+    property_id = Column(Integer, nullable=False)
+    landlord_id = Column(Integer, nullable=False)
+
+    __table_args__ = (
+        Index("ix_address_tokens_token", "token", "property_id"),
+        Index("ix_address_tokens_landlord_token", "landlord_id", "token", "property_id"),
+        Index("ix_address_tokens_property", "property_id", "token"),
+    )
+
+
+class AddressTrigram(Base):
+    """Address token trigrams per property, for typo-tolerant fallback lookups."""
+
+    __tablename__ = "property_address_trigrams"
+    __track_changes__ = False
+
+    id = Column(Integer, primary_key=True)
+    trigram = Column(String, nullable=False)
+    property_id = Column(Integer, nullable=False)
+    landlord_id = Column(Integer, nullable=False)
+
+    __table_args__ = (
+        Index("ix_address_trigrams_trigram", "trigram", "landlord_id", "property_id"),
+        # Covers the fallback's per-candidate trigram counts
+        Index("ix_address_trigrams_property_trigram", "property_id", "trigram"),
+    )
+
+
+def _index_rows(properties):
+    token_rows, trigram_rows = [], []
+    for property_id, address, landlord_id in properties:
+        tokens = set(normalize_tokens(address or ""))
+        grams = set()
+        for token in tokens:
+            token_rows.append({"token": token, "property_id": property_id, "landlord_id": landlord_id})
+            grams |= trigrams(token)
+        trigram_rows.extend(
+            {"trigram": gram, "property_id": property_id, "landlord_id": landlord_id}
+            for gram in grams
+        )
+    return token_rows, trigram_rows
+
+
+def reindex(connection, properties, removed_ids=()):
+    """Replace index rows for ``properties`` (id, address, landlord_id) and drop ``removed_ids``."""
+    ids = [p[0] for p in properties] + list(removed_ids)
+    if not ids:
+        return
+    connection.execute(delete(AddressToken.__table__).where(AddressToken.property_id.in_(ids)))
+    connection.execute(delete(AddressTrigram.__table__).where(AddressTrigram.property_id.in_(ids)))
+    token_rows, trigram_rows = _index_rows(properties)
+    if token_rows:
+        connection.execute(insert(AddressToken.__table__), token_rows)
+    if trigram_rows:
+        connection.execute(insert(AddressTrigram.__table__), trigram_rows)
+
+
+def rebuild(db: Session, batch_size: int = 5000):
+    """Index every property that has no index rows yet; used to backfill the index.
+
+    Commits after each batch, so API writes are only locked out for one
+    batch at a time, and a backfill interrupted by a restart resumes where
+    it stopped. Returns the number of properties indexed.
+    """
+    last_id = 0
+    indexed = 0
+    while True:
+        batch = db.execute(
+            select(Property.id, Property.address, Property.landlord_id)
+            .where(Property.id > last_id)
+            .order_by(Property.id)
+            .limit(batch_size)
+        ).all()
+        if not batch:
+            return indexed
+        last_id = batch[-1][0]
+        present = set(
+            db.scalars(
+                select(AddressToken.property_id)
+                .where(AddressToken.property_id.in_([row[0] for row in batch]))
+                .distinct()
+            )
+        )
+        missing = [tuple(row) for row in batch if row[0] not in present]
+        if missing:
+            reindex(db.connection(), missing)
+            indexed += len(missing)
+        db.commit()
+
+
+def _prefix_match(column, term: str, exact: bool):
+    if exact:
+        return column == term
+    # Range condition so the lookup stays an index range scan
+    return (column >= term) & (column < term + "\uffff")
+
+
+def _trigram_matches(db: Session, terms, landlord_id, limit):
+    """Properties sharing at least half of the trigrams of ``terms``, best first.
+
+    Each trigram is probed for at most ``TRIGRAM_CANDIDATES`` properties, and
+    only the hits of the ``TRIGRAM_PROBES`` rarest ones become candidates, so
+    the cost is bounded whatever the table size. On very common trigrams the
+    candidates are a sample, not every match.
+    """
+    grams = set()
+    for term in terms:
+        grams |= trigrams(term)
+    probes = []
+    for gram in grams:
+        probe = select(AddressTrigram.trigram, AddressTrigram.property_id).where(
+            AddressTrigram.trigram == gram
+        )
+        if landlord_id is not None:
+            probe = probe.where(AddressTrigram.landlord_id == landlord_id)
+        probes.append(select(probe.limit(TRIGRAM_CANDIDATES).subquery()))
+    hits = defaultdict(list)
+    for gram, property_id in db.execute(union_all(*probes)):
+        hits[gram].append(property_id)
+    rarest = sorted(hits.values(), key=len)[:TRIGRAM_PROBES]
+    candidates = {property_id for ids in rarest for property_id in ids}
+    if not candidates:
+        return []
+
+    matches = func.count(AddressTrigram.id)
+    stmt = (
+        select(AddressTrigram.property_id)
+        .where(AddressTrigram.property_id.in_(candidates), AddressTrigram.trigram.in_(grams))
+        .group_by(AddressTrigram.property_id)
+        .having(matches >= max(1, len(grams) // 2))
+        .order_by(matches.desc(), AddressTrigram.property_id)
+        .limit(limit)
+    )
+    return db.scalars(stmt).all()
+
+
+def autocomplete(db: Session, q: str, landlord_id: int = None, limit: int = 10):
+    """Properties whose address matches every word of ``q``, the last one as a prefix.
+
+    Falls back to trigram similarity when nothing matches, to tolerate typos,
+    if the longest word has at least ``TRIGRAM_MIN_LENGTH`` characters.
+    """
+    terms = normalize_tokens(q, expand_last=False)
+    if not terms:
+        return []
+
+    # Drive the join from the most selective (longest) term
+    last = terms[-1]
+    ordered = sorted(set(terms), key=len, reverse=True)
+    aliases = [aliased(AddressToken) for _ in ordered]
+    stmt = select(aliases[0].property_id).distinct()
+    for i, (alias, term) in enumerate(zip(aliases, ordered)):
+        condition = _prefix_match(alias.token, term, exact=term != last)
+        if i == 0:
+            stmt = stmt.where(condition)
+            if landlord_id is not None:
+                stmt = stmt.where(alias.landlord_id == landlord_id)
+        else:
+            stmt = stmt.join(
+                alias, (alias.property_id == aliases[0].property_id) & condition
+            )
+    ids = db.scalars(stmt.limit(limit)).all()
+
+    if not ids and len(max(terms, key=len)) >= TRIGRAM_MIN_LENGTH:
+        ids = _trigram_matches(db, terms, landlord_id, limit)
+
+    if not ids:
+        return []
+    rows = db.execute(
+        select(Property.id, Property.address, Property.landlord_id).where(Property.id.in_(ids))
+    ).all()
+    by_id = {row.id: row for row in rows}
+    return [
+        {"id": row.id, "address": row.address, "landlord_id": row.landlord_id}
+        for row in (by_id.get(id) for id in ids)
+        if row is not None
+    ]
+
+
+@event.listens_for(Session, "after_flush")
+def _update_address_index(session, flush_context):
+    changed, removed = [], []
+    for obj in session.new:
+        if isinstance(obj, Property):
+            changed.append((obj.id, obj.address, obj.landlord_id))
+    for obj in session.dirty:
+        if isinstance(obj, Property) and session.is_modified(obj, include_collections=False):
+            changed.append((obj.id, obj.address, obj.landlord_id))
+    for obj in session.deleted:
+        if isinstance(obj, Property):
+            removed.append(obj.id)
+    if changed or removed:
+        reindex(session.connection(), changed, removed)
+
+
+@on_bulk_write
+def _update_bulk_address_index(session, model, op, rows, values):
+    if model is not Property:
+        return
+    if op == "delete":
+        reindex(session.connection(), [], [row["id"] for row in rows])
+    else:
+        rows = [{**row, **values} for row in rows]
+        reindex(session.connection(), [(r["id"], r["address"], r["landlord_id"]) for r in rows])
@@ -0,0 +1,132 @@
+from datetime import datetime, timedelta
+
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, delete, insert, literal, select, union_all
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from models.base import Base
+from models.change import Change
+from models.issue import Issue
+from models.row_count import RowCount
+
+
+class RestoreConflict(Exception):
+    """An archived issue cannot be restored because a live issue already has its id."""
+
+
+class ArchivedIssue(Base):
+    """Cold storage for issues resolved long ago; rows keep their original ids."""
+
+    __tablename__ = "issues_archive"
+    # Archiving is recorded explicitly as an "archive" op on the issues entity
+    __track_changes__ = False
+    __count_rows__ = True
+
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    description = Column(String, nullable=False)
+    location = Column(String, nullable=False)
+    action = Column(String, nullable=False)
+    resolved = Column(Boolean, default=False)
+    created_at = Column(DateTime, nullable=False)
+    resolved_at = Column(DateTime, nullable=True)
+    property_id = Column(Integer, ForeignKey("properties.id", ondelete="SET NULL"), nullable=True)
+    archived_at = Column(DateTime, nullable=False)
+
+    def __repr__(self):
+        return f"<ArchivedIssue(id={self.id}, description='{self.description}', resolved={self.resolved})>"
+
+    @staticmethod
+    def _columns(table):
+        # Issue columns shared by both tables, in declaration order
+        return [table.c[column.name] for column in Issue.__table__.columns]
+
+    @staticmethod
+    def archive_resolved(db: Session, older_than: timedelta, batch_size: int = 1000):
+        """Move issues resolved before ``now - older_than`` into the archive table.
+
+        Works in batches of set-based INSERT ... SELECT / DELETE statements, one
+        transaction per batch. Returns the number of issues archived.
+        """
+        cutoff = datetime.utcnow() - older_than
+        live = Issue.__table__
+        archive = ArchivedIssue.__table__
+        total = 0
+        while True:
+            ids = db.scalars(
+                select(live.c.id)
+                .where(live.c.resolved.is_(True), live.c.resolved_at < cutoff)
+                .limit(batch_size)
+            ).all()
+            if not ids:
+                return total
+
+            columns = ArchivedIssue._columns(live)
+            db.execute(
+                insert(archive).from_select(
+                    [c.name for c in columns] + ["archived_at"],
+                    select(*columns, literal(datetime.utcnow())).where(live.c.id.in_(ids)),
+                )
+            )
+            db.execute(delete(live).where(live.c.id.in_(ids)))
+            Change.record(db.connection(), [("issues", id, "archive") for id in ids])
+            RowCount.adjust(db.connection(), {"issues": -len(ids), "issues_archive": len(ids)})
+            db.commit()
+            total += len(ids)
+
+    @staticmethod
+    def restore(db: Session, issue_id: int, reopen: bool = False):
+        """Move an archived issue back into the live table, optionally reopening it.
+
+        Raises RestoreConflict if a live issue already uses the id.
+        """
+        archived = ArchivedIssue.get(db, issue_id)
+        if archived is None:
+            return None
+        if Issue.get(db, issue_id) is not None:
+            raise RestoreConflict(f"A live issue with ID {issue_id} already exists")
+        data = {column.name: getattr(archived, column.name) for column in Issue.__table__.columns}
+        db.delete(archived)
+        issue = Issue(**data)
+        if reopen:
+            issue.resolved = False
+        # Recorded as a "create" of the issue in the change feed
+        db.add(issue)
+        # Keeps it out of the daily "created" counts (see models/issue_stats.py)
+        restored = db.info.setdefault("restored_issue_ids", set())
+        restored.add(issue_id)
+        try:
+            db.commit()
+        except IntegrityError:
+            # Taken by an issue created since the check above
+            db.rollback()
+            raise RestoreConflict(f"A live issue with ID {issue_id} already exists")
+        finally:
+            restored.discard(issue_id)
+        db.refresh(issue)
+        return issue
+
+    @staticmethod
+    def get_all_with_live(db: Session, skip: int = 0, limit: int = 100, fields=None, after=None):
+        """Live and archived issues together, ordered by id, each flagged ``archived``.
+
+        ``fields`` (from Issue.parse_fields) limits the selected columns, and
+        ``after`` lists only issues whose id is greater.
+        """
+        def columns(table):
+            cols = ArchivedIssue._columns(table)
+            if fields:
+                # id is always selected for ordering
+                cols = [c for c in cols if c.name in fields or c.name == "id"]
+            return cols
+
+        live = select(*columns(Issue.__table__), literal(False).label("archived"))
+        archived = select(*columns(ArchivedIssue.__table__), literal(True).label("archived"))
+        if after is not None:
+            live = live.where(Issue.__table__.c.id > after)
+            archived = archived.where(ArchivedIssue.__table__.c.id > after)
+        combined = union_all(live, archived).subquery()
+        output = [combined.c[name] for name in fields] + [combined.c.archived] if fields else [combined]
+        rows = db.execute(
+            select(*output).order_by(combined.c.id).offset(skip).limit(limit)
+        ).mappings()
+        return [dict(row) for row in rows]
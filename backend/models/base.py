@@ -1,3 +1,191 @@
-from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy import bindparam, delete, select, update
+from sqlalchemy.orm import Session, declarative_base
 
-Base = declarative_base()
+# Set-based writes bypass the unit of work, and with it every after_flush hook.
+# Listeners registered here get ``(session, model, op, rows, values)`` for them
+# instead: ``rows`` are the affected rows as they were before the write and
+# ``values`` the columns an "update" set.
+_bulk_write_listeners = []
+
+
+def on_bulk_write(fn):
+    _bulk_write_listeners.append(fn)
+    return fn
+
+
+def notify_bulk_write(session: Session, model, op: str, rows, values=None):
+    for listener in _bulk_write_listeners:
+        listener(session, model, op, rows, values or {})
+
+
+class DeleteRestricted(Exception):
+    """A row cannot be deleted because a RESTRICT foreign key still references it."""
+
+
+class CRUDMixin:
+    """Shared create/get/get_all/update/delete for every model.
+
+    Statements are built once per model with bound parameters and reused, so
+    each call skips statement construction and hits SQLAlchemy's compiled
+    cache directly.
+    """
+
+    # Writes are recorded in the change feed (see models/change.py)
+    __track_changes__ = True
+
+    # Row count is kept in a counter for list totals (see models/row_count.py)
+    __count_rows__ = False
+
+    _statements = {}
+
+    @classmethod
+    def _statement(cls, name, fields=None):
+        key = (cls, name, fields)
+        stmt = CRUDMixin._statements.get(key)
+        if stmt is None:
+            entities = [cls.__table__.c[f] for f in fields] if fields else [cls]
+            if name == "get":
+                stmt = select(*entities).where(cls.id == bindparam("id"))
+            elif name == "get_all":
+                stmt = (
+                    select(*entities)
+                    .order_by(cls.id)
+                    .offset(bindparam("skip"))
+                    .limit(bindparam("limit"))
+                )
+            elif name == "get_after":
+                # Keyset page: rows after a cursor id, found by an index range scan
+                stmt = (
+                    select(*entities)
+                    .where(cls.id > bindparam("after"))
+                    .order_by(cls.id)
+                    .offset(bindparam("skip"))
+                    .limit(bindparam("limit"))
+                )
+            else:
+                raise KeyError(name)
+            CRUDMixin._statements[key] = stmt
+        return stmt
+
+    @classmethod
+    def parse_fields(cls, fields, required=()):
+        """Turn a ``"id,address"`` sparse fieldset into a tuple of column names.
+
+        Names come back in table column order, plus any ``required`` ones, so
+        every spelling of a fieldset shares one cached statement. Returns None
+        for an empty fieldset; raises ValueError on unknown names.
+        """
+        if not fields:
+            return None
+        names = {f.strip() for f in fields.split(",") if f.strip()}
+        unknown = sorted(names - set(cls.__table__.c.keys()))
+        if unknown:
+            raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+        if not names:
+            return None
+        names |= set(required)
+        return tuple(name for name in cls.__table__.c.keys() if name in names)
+
+    @classmethod
+    def create(cls, db: Session, data: dict):
+        obj = cls(**data)
+        db.add(obj)
+        db.commit()
+        db.refresh(obj)
+        return obj
+
+    @classmethod
+    def get(cls, db: Session, id: int):
+        return db.scalars(cls._statement("get"), {"id": id}).first()
+
+    @classmethod
+    def get_all(cls, db: Session, skip: int = 0, limit: int = 100, fields=None, after=None):
+        """List rows; with ``fields`` (from parse_fields) only those columns are
+        selected and plain dicts are returned instead of model objects. With
+        ``after``, only rows whose id is greater are listed."""
+        name = "get_all" if after is None else "get_after"
+        params = {"skip": skip, "limit": limit, "after": after}
+        if fields:
+            rows = db.execute(cls._statement(name, fields), params).mappings()
+            return [dict(row) for row in rows]
+        return db.scalars(cls._statement(name), params).all()
+
+    @classmethod
+    def update(cls, db: Session, id: int, data: dict):
+        obj = cls.get(db, id)
+        if obj:
+            for key, value in data.items():
+                setattr(obj, key, value)
+            db.commit()
+            db.refresh(obj)
+        return obj
+
+    @classmethod
+    def delete(cls, db: Session, id: int):
+        obj = cls.get(db, id)
+        if obj:
+            try:
+                cls._delete_dependents(db, [id])
+            except DeleteRestricted:
+                db.rollback()
+                raise
+            db.delete(obj)
+            db.commit()
+            return True
+        return False
+
+    @classmethod
+    def _dependents(cls):
+        """(model, column, policy) for each foreign key referencing this model.
+
+        The policy is the key's ``ondelete`` (a key without one restricts).
+        Restrictions are checked first and cascades run before nullifications,
+        children first, so rows about to be deleted are never updated.
+        """
+        models = {mapper.local_table: mapper.class_ for mapper in cls.registry.mappers}
+        dependents = []
+        for table in reversed(cls.metadata.sorted_tables):
+            for fk in table.foreign_keys:
+                if fk.column.table is cls.__table__ and table in models:
+                    policy = (fk.ondelete or "RESTRICT").upper()
+                    dependents.append((models[table], fk.parent, policy))
+        order = {"RESTRICT": 0, "NO ACTION": 0, "CASCADE": 1}
+        return sorted(dependents, key=lambda d: order.get(d[2], 2))
+
+    @classmethod
+    def _delete_dependents(cls, db: Session, ids):
+        """Apply the ON DELETE policy of every referencing foreign key to ``ids``.
+
+        ``ids`` is a list or a SELECT of ids. Each policy is one set-based
+        statement per foreign key, however many rows it touches, and nested
+        cascades reuse the parent's condition as a subquery. Child collections
+        are never loaded (relationships use ``passive_deletes``), and the
+        affected rows are passed to the ``on_bulk_write`` listeners.
+        """
+        for model, column, policy in cls._dependents():
+            table = model.__table__
+            condition = column.in_(ids)
+            if policy in ("RESTRICT", "NO ACTION"):
+                if db.scalar(select(table.c.id).where(condition).limit(1)) is not None:
+                    raise DeleteRestricted(
+                        f"{cls.__tablename__} row is still referenced by {table.name}.{column.name}"
+                    )
+                continue
+
+            if policy == "CASCADE":
+                model._delete_dependents(db, select(table.c.id).where(condition))
+            rows = db.execute(select(table).where(condition)).mappings().all()
+            if not rows:
+                continue
+            if policy == "CASCADE":
+                db.execute(delete(table).where(condition))
+                notify_bulk_write(db, model, "delete", rows)
+            elif policy == "SET NULL":
+                values = {column.name: None}
+                db.execute(update(table).where(condition).values(values))
+                notify_bulk_write(db, model, "update", rows, values)
+            else:
+                raise ValueError(f"Unsupported ondelete policy {policy!r} on {table.name}.{column.name}")
+
+
+Base = declarative_base(cls=CRUDMixin)
@@ -0,0 +1,87 @@
+from datetime import datetime, timedelta
+
+from sqlalchemy import Column, DateTime, Integer, String, delete, event, func, insert, select
+from sqlalchemy.orm import Session
+
+from models.base import Base, on_bulk_write
+
+
+class Change(Base):
+    """Append-only log of writes, one compact row per created/updated/deleted entity."""
+
+    __tablename__ = "changes"
+    __track_changes__ = False
+
+    seq = Column(Integer, primary_key=True, autoincrement=True)
+    entity = Column(String, nullable=False)  # table name, e.g. "issues"
+    entity_id = Column(Integer, nullable=False)
+    op = Column(String, nullable=False)  # "create", "update" or "delete"
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+    def __repr__(self):
+        return f"<Change(seq={self.seq}, entity='{self.entity}', id={self.entity_id}, op='{self.op}')>"
+
+    def to_dict(self):
+        return {"seq": self.seq, "entity": self.entity, "id": self.entity_id, "op": self.op}
+
+    @staticmethod
+    def since(db: Session, seq: int, limit: int = 1000):
+        return db.scalars(
+            select(Change).where(Change.seq > seq).order_by(Change.seq).limit(limit)
+        ).all()
+
+    @staticmethod
+    def last_seq(db: Session):
+        return db.scalar(select(func.max(Change.seq))) or 0
+
+    @staticmethod
+    def record(connection, entries):
+        """Record (entity, entity_id, op) entries for writes made outside the ORM unit of work."""
+        now = datetime.utcnow()
+        rows = [
+            {"entity": entity, "entity_id": entity_id, "op": op, "created_at": now}
+            for entity, entity_id, op in entries
+        ]
+        if rows:
+            connection.execute(insert(Change), rows)
+
+    @staticmethod
+    def compact(db: Session, older_than: timedelta = timedelta(hours=1)):
+        """Keep only the latest entry per entity among entries older than ``older_than``.
+
+        Recent entries are left untouched so live consumers still see every
+        change; a consumer resuming from an old seq gets the final op for each
+        entity, which is all it needs to converge.
+        """
+        cutoff = datetime.utcnow() - older_than
+        latest = select(func.max(Change.seq)).group_by(Change.entity, Change.entity_id)
+        result = db.execute(
+            delete(Change).where(Change.created_at < cutoff, Change.seq.not_in(latest))
+        )
+        db.commit()
+        return result.rowcount
+
+
+@event.listens_for(Session, "after_flush")
+def _record_changes(session, flush_context):
+    entries = []
+    for op, objects in (
+        ("create", session.new),
+        ("update", session.dirty),
+        ("delete", session.deleted),
+    ):
+        for obj in objects:
+            if not getattr(obj, "__track_changes__", False):
+                continue
+            if op == "update" and not session.is_modified(obj, include_collections=False):
+                continue
+            entries.append((obj.__tablename__, obj.id, op))
+    Change.record(session.connection(), entries)
+
+
+@on_bulk_write
+def _record_bulk_changes(session, model, op, rows, values):
+    if model.__track_changes__:
+        Change.record(
+            session.connection(), [(model.__tablename__, row["id"], op) for row in rows]
+        )
@@ -0,0 +1,42 @@
+from datetime import datetime
+
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, String, Text
+
+from models.base import Base
+
+
+class Conversation(Base):
+    """One assistant conversation: the global chat or a tenant's chat."""
+
+    __tablename__ = "conversations"
+    __track_changes__ = False
+
+    id = Column(Integer, primary_key=True)
+    key = Column(String, unique=True, nullable=False)  # "global" or "tenant:<id>"
+    tenant_id = Column(Integer, ForeignKey("tenants.id", ondelete="CASCADE"), nullable=True)
+    summary = Column(Text, nullable=True)  # Compressed form of the turns folded out of the window
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+    def __repr__(self):
+        return f"<Conversation(id={self.id}, key='{self.key}')>"
+
+
+class ConversationMessage(Base):
+    """A message in a conversation that has not been folded into its summary yet."""
+
+    __tablename__ = "conversation_messages"
+    __track_changes__ = False
+
+    id = Column(Integer, primary_key=True)
+    conversation_id = Column(
+        Integer, ForeignKey("conversations.id", ondelete="CASCADE"), nullable=False
+    )
+    role = Column(String, nullable=False)  # "human", "ai" or "system"
+    content = Column(Text, nullable=False)
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+    # Resuming reads the newest rows of one conversation: a short index range scan
+    __table_args__ = (Index("ix_conversation_messages_conversation_id", "conversation_id", "id"),)
+
+    def __repr__(self):
+        return f"<ConversationMessage(id={self.id}, role='{self.role}')>"
@@ -1,55 +1,41 @@
-from sqlalchemy import Column, Integer, String, Boolean, ForeignKey, Text
-from sqlalchemy.orm import relationship, Session
+from datetime import datetime
+
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Index, Text, event
+from sqlalchemy.orm import relationship
 from models.base import Base
 
 
 class Issue(Base):
     __tablename__ = "issues"
+    __count_rows__ = True
 
     id = Column(Integer, primary_key=True, index=True)
     description = Column(String, nullable=False)
     location = Column(String, nullable=False)
     action = Column(String, nullable=False)
     resolved = Column(Boolean, default=False)
-    property_id = Column(Integer, ForeignKey("properties.id"), nullable=True)
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    resolved_at = Column(DateTime, nullable=True)  # Set when resolved flips to True
+    property_id = Column(Integer, ForeignKey("properties.id", ondelete="SET NULL"), nullable=True)
 
     # Create relationship to Property model
     property = relationship("Property", back_populates="issues")
 
+    # Lets the archive job find long-resolved issues without a table scan.
+    # AUTOINCREMENT stops SQLite reusing the ids of issues moved to the archive.
+    __table_args__ = (
+        Index("ix_issues_resolved_resolved_at", "resolved", "resolved_at"),
+        {"sqlite_autoincrement": True},
+    )
+
     def __repr__(self):
         return f"<Issue(id={self.id}, description='{self.description}', resolved={self.resolved})>"
 
-    @staticmethod
-    def create(db: Session, issue_data: dict):
-        issue = Issue(**issue_data)
-        db.add(issue)
-        db.commit()
-        db.refresh(issue)
-        return issue
-
-    @staticmethod
-    def get(db: Session, issue_id: int):
-        return db.query(Issue).filter(Issue.id == issue_id).first()
-
-    @staticmethod
-    def get_all(db: Session, skip: int = 0, limit: int = 100):
-        return db.query(Issue).offset(skip).limit(limit).all()
-
-    @staticmethod
-    def update(db: Session, issue_id: int, issue_data: dict):
-        issue = Issue.get(db, issue_id)
-        if issue:
-            for key, value in issue_data.items():
-                setattr(issue, key, value)
-            db.commit()
-            db.refresh(issue)
-        return issue
-
-    @staticmethod
-    def delete(db: Session, issue_id: int):
-        issue = Issue.get(db, issue_id)
-        if issue:
-            db.delete(issue)
-            db.commit()
-            return True
-        return False
+
+@event.listens_for(Issue.resolved, "set", active_history=True)
+def _track_resolved_at(issue, value, oldvalue, initiator):
+    # oldvalue is a NO_VALUE symbol for new objects, so compare against True
+    if value and oldvalue is not True:
+        issue.resolved_at = datetime.utcnow()
+    elif not value:
+        issue.resolved_at = None
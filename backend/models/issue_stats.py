@@ -0,0 +1,264 @@
+from collections import defaultdict
+from datetime import datetime, timedelta
+
+from sqlalchemy import Column, Date, Float, Integer, case, event, func, inspect, literal, select, true
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from models.base import Base, on_bulk_write
+from models.issue import Issue
+
+# property_key values for issues without a property and for the portfolio-wide rollup
+NO_PROPERTY = 0
+ALL_PROPERTIES = -1
+
+
+class IssueDailyStats(Base):
+    """Per-day, per-property issue counts, maintained incrementally on every issue write."""
+
+    __tablename__ = "issue_daily_stats"
+    __track_changes__ = False
+
+    day = Column(Date, primary_key=True)
+    property_key = Column(Integer, primary_key=True)
+    created = Column(Integer, nullable=False, default=0)
+    resolved = Column(Integer, nullable=False, default=0)
+    reopened = Column(Integer, nullable=False, default=0)
+    resolution_seconds = Column(Float, nullable=False, default=0.0)
+    open = Column(Integer, nullable=False, default=0)  # Open issues at the last write of the day
+
+    def __repr__(self):
+        return f"<IssueDailyStats(day={self.day}, property_key={self.property_key}, created={self.created}, resolved={self.resolved})>"
+
+    @staticmethod
+    def report(db: Session, property_id: int = None, days: int = 30):
+        """Daily rows and totals for the last ``days`` days, read only from the summary tables."""
+        key = ALL_PROPERTIES if property_id is None else property_id
+        start = datetime.utcnow().date() - timedelta(days=days - 1)
+        rows = db.scalars(
+            select(IssueDailyStats)
+            .where(IssueDailyStats.property_key == key, IssueDailyStats.day >= start)
+            .order_by(IssueDailyStats.day)
+        ).all()
+        open_now = db.scalar(
+            select(IssueOpenCount.open).where(IssueOpenCount.property_key == key)
+        )
+
+        created = sum(row.created for row in rows)
+        resolved = sum(row.resolved for row in rows)
+        resolution_seconds = sum(row.resolution_seconds for row in rows)
+        return {
+            "property_id": property_id,
+            "days": days,
+            "open": open_now or 0,
+            "created": created,
+            "resolved": resolved,
+            "reopened": sum(row.reopened for row in rows),
+            "avg_resolution_hours": (
+                round(resolution_seconds / resolved / 3600, 2) if resolved else None
+            ),
+            "daily": [
+                {
+                    "day": row.day.isoformat(),
+                    "open": row.open,
+                    "created": row.created,
+                    "resolved": row.resolved,
+                    "reopened": row.reopened,
+                    "resolution_seconds": row.resolution_seconds,
+                }
+                for row in rows
+            ],
+        }
+
+
+class IssueOpenCount(Base):
+    """Running count of open issues per property key."""
+
+    __tablename__ = "issue_open_counts"
+    __track_changes__ = False
+
+    property_key = Column(Integer, primary_key=True)
+    open = Column(Integer, nullable=False, default=0)
+
+
+def seed_open_counts(db: Session):
+    """Seed ``issue_open_counts`` from the ``issues`` table if it has never been filled.
+
+    Returns True if it seeded. Later changes are applied as deltas by the
+    flush hooks, which assume the counts start from the real open issues.
+    """
+    if db.scalar(select(IssueOpenCount.property_key).limit(1)) is not None:
+        return False
+    issues = Issue.__table__
+    key = case((issues.c.property_id.is_(None), NO_PROPERTY), else_=issues.c.property_id)
+    open_issues = issues.c.resolved.is_not(True)
+    per_property = select(key, func.count()).where(open_issues).group_by(key)
+    # The rollup row is written even when nothing is open, marking the table as seeded
+    rollup = select(literal(ALL_PROPERTIES), func.count()).select_from(issues).where(open_issues)
+    table = IssueOpenCount.__table__
+    for rows in (per_property, rollup):
+        stmt = _upsert(db.connection(), table).from_select(
+            ["property_key", "open"], rows.where(true())
+        )
+        db.execute(stmt.on_conflict_do_nothing(index_elements=[table.c.property_key]))
+    db.commit()
+    return True
+
+
+def _upsert(connection, table):
+    dialect = postgresql if connection.dialect.name == "postgresql" else sqlite
+    return dialect.insert(table)
+
+
+_UPSERTS = {}  # dialect name -> (open-count upsert, daily-stats upsert)
+
+
+def _upserts(connection):
+    """Open-count and daily-stats upserts for this dialect, built once and reused."""
+    name = connection.dialect.name
+    if name not in _UPSERTS:
+        open_table = IssueOpenCount.__table__
+        daily_table = IssueDailyStats.__table__
+        open_stmt = _upsert(connection, open_table)
+        daily_stmt = _upsert(connection, daily_table)
+        _UPSERTS[name] = (
+            open_stmt.on_conflict_do_update(
+                index_elements=[open_table.c.property_key],
+                set_={"open": open_table.c.open + open_stmt.excluded.open},
+            ).returning(open_table.c.property_key, open_table.c.open),
+            daily_stmt.on_conflict_do_update(
+                index_elements=[daily_table.c.day, daily_table.c.property_key],
+                set_={
+                    "created": daily_table.c.created + daily_stmt.excluded.created,
+                    "resolved": daily_table.c.resolved + daily_stmt.excluded.resolved,
+                    "reopened": daily_table.c.reopened + daily_stmt.excluded.reopened,
+                    "resolution_seconds": daily_table.c.resolution_seconds
+                    + daily_stmt.excluded.resolution_seconds,
+                    "open": daily_stmt.excluded.open,
+                },
+            ),
+        )
+    return _UPSERTS[name]
+
+
+def apply_issue_deltas(connection, deltas):
+    """Apply ``{(day, property_key): [created, resolved, reopened, resolution_seconds, open_delta]}``.
+
+    Each delta is also added to the ALL_PROPERTIES rollup. Both tables are
+    upserted with one executemany each, which SQLAlchemy batches into
+    multi-row statements, so a bulk write touching thousands of properties
+    costs a few statements rather than two per property.
+    """
+    combined = defaultdict(lambda: [0, 0, 0, 0.0, 0])
+    for (day, key), values in deltas.items():
+        for target in (key, ALL_PROPERTIES):
+            totals = combined[(day, target)]
+            for i, value in enumerate(values):
+                totals[i] += value
+
+    open_upsert, daily_upsert = _upserts(connection)
+    open_deltas = defaultdict(int)
+    for (day, key), values in combined.items():
+        open_deltas[key] += values[4]
+    open_now = dict(
+        connection.execute(
+            open_upsert,
+            [{"property_key": key, "open": delta} for key, delta in open_deltas.items()],
+        ).all()
+    )
+    connection.execute(
+        daily_upsert,
+        [
+            {
+                "day": day,
+                "property_key": key,
+                "created": created,
+                "resolved": resolved,
+                "reopened": reopened,
+                "resolution_seconds": seconds,
+                "open": open_now[key],
+            }
+            for (day, key), (created, resolved, reopened, seconds, _) in combined.items()
+        ],
+    )
+
+
+def _property_key(property_id):
+    return NO_PROPERTY if property_id is None else property_id
+
+
+def _old_value(state, name):
+    history = state.attrs[name].history
+    if history.deleted:
+        return history.deleted[0]
+    return getattr(state.obj(), name)
+
+
+@event.listens_for(Session, "after_flush")
+def _update_issue_stats(session, flush_context):
+    deltas = defaultdict(lambda: [0, 0, 0, 0.0, 0])
+    today = datetime.utcnow().date()
+    key = _property_key
+
+    restored = session.info.get("restored_issue_ids", ())
+    for obj in session.new:
+        if not isinstance(obj, Issue):
+            continue
+        if obj.id in restored:
+            # Restored from the archive: already counted when first created
+            if not obj.resolved:
+                deltas[(today, key(obj.property_id))][4] += 1
+            continue
+        totals = deltas[(today, key(obj.property_id))]
+        totals[0] += 1
+        if obj.resolved:
+            totals[1] += 1
+        else:
+            totals[4] += 1
+
+    for obj in session.dirty:
+        if not isinstance(obj, Issue) or not session.is_modified(obj, include_collections=False):
+            continue
+        state = inspect(obj)
+        was_resolved = bool(_old_value(state, "resolved"))
+        old_key = key(_old_value(state, "property_id"))
+        new_key = key(obj.property_id)
+        if not was_resolved:
+            deltas[(today, old_key)][4] -= 1
+        if not obj.resolved:
+            deltas[(today, new_key)][4] += 1
+        if obj.resolved and not was_resolved:
+            totals = deltas[(today, new_key)]
+            totals[1] += 1
+            if obj.created_at is not None and obj.resolved_at is not None:
+                totals[3] += (obj.resolved_at - obj.created_at).total_seconds()
+        elif was_resolved and not obj.resolved:
+            deltas[(today, new_key)][2] += 1
+
+    for obj in session.deleted:
+        if isinstance(obj, Issue) and not obj.resolved:
+            deltas[(today, key(obj.property_id))][4] -= 1
+
+    # Drop no-op entries, e.g. an update that touched neither resolved nor property_id
+    deltas = {k: v for k, v in deltas.items() if any(v)}
+    if deltas:
+        apply_issue_deltas(session.connection(), deltas)
+
+
+@on_bulk_write
+def _update_bulk_issue_stats(session, model, op, rows, values):
+    if model is not Issue:
+        return
+    deltas = defaultdict(lambda: [0, 0, 0, 0.0, 0])
+    today = datetime.utcnow().date()
+    for row in rows:
+        if row["resolved"]:
+            continue
+        # Only deletes and property reassignments reach here; both move open counts
+        deltas[(today, _property_key(row["property_id"]))][4] -= 1
+        if op == "update":
+            new_key = _property_key(values.get("property_id", row["property_id"]))
+            deltas[(today, new_key)][4] += 1
+    deltas = {k: v for k, v in deltas.items() if any(v)}
+    if deltas:
+        apply_issue_deltas(session.connection(), deltas)
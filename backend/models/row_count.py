@@ -0,0 +1,125 @@
+import os
+import time
+from collections import Counter
+from datetime import datetime
+
+from sqlalchemy import Column, DateTime, Integer, String, bindparam, event, func, literal, select, true, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from models.base import Base, on_bulk_write
+
+ROW_COUNT_FALLBACK_TTL = float(os.getenv("ROW_COUNT_FALLBACK_TTL", "60"))
+
+# (expires_at, count) for tables whose counter has not been seeded yet, by table name
+_fallback_counts = {}
+
+
+class RowCount(Base):
+    """Exact row count per table, kept in sync by every write path.
+
+    Counters are seeded (and reconciled) with one ``COUNT(*)`` by ``refresh``;
+    after that, list totals are a primary-key lookup instead of a table scan.
+    Only models with ``__count_rows__`` are counted.
+    """
+
+    __tablename__ = "row_counts"
+    __track_changes__ = False
+
+    table_name = Column(String, primary_key=True)
+    count = Column(Integer, nullable=False)
+    refreshed_at = Column(DateTime, nullable=False)
+
+    def __repr__(self):
+        return f"<RowCount(table_name='{self.table_name}', count={self.count})>"
+
+    @staticmethod
+    def adjust(connection, deltas):
+        """Apply ``{table_name: delta}``. Unseeded counters are left alone; seeding counts those rows."""
+        params = [{"name": name, "delta": delta} for name, delta in deltas.items() if delta]
+        if params:
+            table = RowCount.__table__
+            connection.execute(
+                update(table)
+                .where(table.c.table_name == bindparam("name"))
+                .values(count=table.c.count + bindparam("delta")),
+                params,
+            )
+
+    @staticmethod
+    def total(db: Session, *models) -> int:
+        """Combined row count of ``models``.
+
+        Reads the counters; a table whose counter isn't seeded yet falls back
+        to a ``COUNT(*)`` cached for ``ROW_COUNT_FALLBACK_TTL`` seconds.
+        """
+        names = [model.__tablename__ for model in models]
+        counts = dict(
+            db.execute(
+                select(RowCount.table_name, RowCount.count).where(RowCount.table_name.in_(names))
+            ).all()
+        )
+        now = time.monotonic()
+        total = 0
+        for model in models:
+            count = counts.get(model.__tablename__)
+            if count is None:
+                cached = _fallback_counts.get(model.__tablename__)
+                if cached is not None and cached[0] > now:
+                    count = cached[1]
+            if count is None:
+                count = db.scalar(select(func.count()).select_from(model.__table__))
+                _fallback_counts[model.__tablename__] = (now + ROW_COUNT_FALLBACK_TTL, count)
+            total += count
+        return total
+
+    @staticmethod
+    def refresh(db: Session):
+        """Seed missing counters and reconcile existing ones with a fresh count.
+
+        Each table is recounted in a single INSERT ... SELECT upsert, so no
+        concurrent write lands between the count and the store.
+        """
+        table = RowCount.__table__
+        dialect = postgresql if db.get_bind().dialect.name == "postgresql" else sqlite
+        for mapper in Base.registry.mappers:
+            model = mapper.class_
+            if not getattr(model, "__count_rows__", False):
+                continue
+            stmt = dialect.insert(table).from_select(
+                ["table_name", "count", "refreshed_at"],
+                select(
+                    literal(model.__tablename__),
+                    func.count(),
+                    literal(datetime.utcnow()),
+                )
+                .select_from(model.__table__)
+                # SQLite needs a WHERE to parse ON CONFLICT after INSERT ... SELECT
+                .where(true()),
+            )
+            db.execute(
+                stmt.on_conflict_do_update(
+                    index_elements=[table.c.table_name],
+                    set_={"count": stmt.excluded.count, "refreshed_at": stmt.excluded.refreshed_at},
+                )
+            )
+            db.commit()
+            _fallback_counts.pop(model.__tablename__, None)
+
+
+@event.listens_for(Session, "after_flush")
+def _count_rows(session, flush_context):
+    deltas = Counter()
+    for obj in session.new:
+        if getattr(obj, "__count_rows__", False):
+            deltas[obj.__tablename__] += 1
+    for obj in session.deleted:
+        if getattr(obj, "__count_rows__", False):
+            deltas[obj.__tablename__] -= 1
+    RowCount.adjust(session.connection(), deltas)
+
+
+@on_bulk_write
+def _count_bulk_rows(session, model, op, rows, values):
+    if op == "delete" and model.__count_rows__:
+        RowCount.adjust(session.connection(), {model.__tablename__: -len(rows)})
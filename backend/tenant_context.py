@@ -0,0 +1,188 @@
+"""Tenant-scoped assistant context.
+
+Instead of the whole database, a tenant's chat only sees their own tenant
+record, property, the property's live issues, their landlord and that
+landlord's contractors. All of it is loaded with one joined query and the
+rendered text is cached per tenant until a related row is written (or the
+entry is older than ``TENANT_CONTEXT_TTL`` seconds, which bounds staleness
+across worker processes and for set-based writes that bypass the ORM).
+"""
+
+import os
+import threading
+import time
+from typing import Optional
+
+from sqlalchemy import event, inspect, select
+from sqlalchemy.orm import Session, joinedload
+
+from database import SessionLocal
+from models.base import on_bulk_write
+from models.contractor import Contractor
+from models.issue import Issue
+from models.landlord import Landlord
+from models.property import Property
+from models.tenant import Tenant
+
+TENANT_CONTEXT_TTL = float(os.getenv("TENANT_CONTEXT_TTL", "300"))
+
+_lock = threading.Lock()
+_cache = {}  # tenant_id -> (expires_at, context, keys)
+_tenants_by_key = {}  # ("property", id) / ("landlord", id) / ("tenant", id) -> {tenant_id}
+_generation = 0  # Bumped on every invalidation so in-flight loads don't cache stale text
+
+
+def _tenant_query(tenant_id: int):
+    return (
+        select(Tenant)
+        .where(Tenant.id == tenant_id)
+        .options(
+            joinedload(Tenant.property).joinedload(Property.issues),
+            joinedload(Tenant.landlord).joinedload(Landlord.contractors),
+        )
+    )
+
+
+def render_tenant_context(tenant: Tenant) -> str:
+    lines = [
+        "TENANT:",
+        f"- Tenant {tenant.id}: {tenant.name}, Email: {tenant.email}, Phone: {tenant.phone_number}",
+    ]
+    prop = tenant.property
+    if prop is not None:
+        lines += ["", "PROPERTY:", f"- Property {prop.id}: {prop.address}"]
+        lines += ["", "ISSUES AT THIS PROPERTY:"]
+        lines += [
+            f"- Issue {i.id}: {i.description} at {i.location}, Action: {i.action}, Resolved: {i.resolved}"
+            for i in sorted(prop.issues, key=lambda i: i.id)
+        ] or ["- None"]
+    landlord = tenant.landlord
+    if landlord is not None:
+        lines += [
+            "",
+            "LANDLORD:",
+            f"- Landlord {landlord.id}: {landlord.name}, Email: {landlord.email}, Phone: {landlord.phone_number}",
+            "",
+            "CONTRACTORS:",
+        ]
+        lines += [
+            f"- Contractor {c.id}: {c.name}, Work: {c.work}, Email: {c.email}, Phone: {c.phone_number}"
+            for c in sorted(landlord.contractors, key=lambda c: c.id)
+        ] or ["- None"]
+    return "\n".join(lines)
+
+
+def get_tenant_context(tenant_id: int) -> Optional[dict]:
+    """Return ``{"context", "property_id"}`` for a tenant, or None if the tenant does not exist."""
+    now = time.monotonic()
+    with _lock:
+        cached = _cache.get(tenant_id)
+    if cached is not None and cached[0] > now:
+        return cached[1]
+    generation = _generation
+
+    with SessionLocal() as db:
+        tenant = db.scalars(_tenant_query(tenant_id)).unique().first()
+        if tenant is None:
+            return None
+        entry = {"context": render_tenant_context(tenant), "property_id": tenant.property_id}
+        keys = {("tenant", tenant.id), ("landlord", tenant.landlord_id)}
+        if tenant.property_id is not None:
+            keys.add(("property", tenant.property_id))
+
+    with _lock:
+        if generation != _generation:
+            return entry
+        _forget(tenant_id)
+        _cache[tenant_id] = (now + TENANT_CONTEXT_TTL, entry, keys)
+        for key in keys:
+            _tenants_by_key.setdefault(key, set()).add(tenant_id)
+    return entry
+
+
+def _forget(tenant_id):
+    cached = _cache.pop(tenant_id, None)
+    if cached is not None:
+        for key in cached[2]:
+            tenants = _tenants_by_key.get(key)
+            if tenants is not None:
+                tenants.discard(tenant_id)
+                if not tenants:
+                    del _tenants_by_key[key]
+
+
+def invalidate(keys):
+    """Drop cached contexts that depend on any of ``keys``."""
+    global _generation
+    with _lock:
+        _generation += 1
+        for key in keys:
+            for tenant_id in list(_tenants_by_key.get(key, ())):
+                _forget(tenant_id)
+
+
+def clear():
+    with _lock:
+        _cache.clear()
+        _tenants_by_key.clear()
+
+
+def _values(obj, name):
+    """Current and, if changed in this flush, previous value of an attribute."""
+    history = inspect(obj).attrs[name].history
+    return {v for v in (*history.added, *history.unchanged, *history.deleted) if v is not None}
+
+
+def _keys_for(obj):
+    if isinstance(obj, Tenant):
+        return {("tenant", obj.id)}
+    if isinstance(obj, Property):
+        return {("property", obj.id)}
+    if isinstance(obj, Issue):
+        return {("property", v) for v in _values(obj, "property_id")}
+    if isinstance(obj, Landlord):
+        return {("landlord", obj.id)}
+    if isinstance(obj, Contractor):
+        return {("landlord", v) for v in _values(obj, "landlord_id")}
+    return set()
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_invalidations(session, flush_context):
+    keys = session.info.setdefault("tenant_context_keys", set())
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        keys |= _keys_for(obj)
+
+
+def _row_keys(model, row):
+    """Like _keys_for, for a row written outside the unit of work (old values)."""
+    if model is Tenant:
+        return {("tenant", row["id"])}
+    if model is Property:
+        return {("property", row["id"])}
+    if model is Issue and row["property_id"] is not None:
+        return {("property", row["property_id"])}
+    if model is Landlord:
+        return {("landlord", row["id"])}
+    if model is Contractor and row["landlord_id"] is not None:
+        return {("landlord", row["landlord_id"])}
+    return set()
+
+
+@on_bulk_write
+def _collect_bulk_invalidations(session, model, op, rows, values):
+    keys = session.info.setdefault("tenant_context_keys", set())
+    for row in rows:
+        keys |= _row_keys(model, row)
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_invalidations(session):
+    keys = session.info.pop("tenant_context_keys", None)
+    if keys:
+        invalidate(keys)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_invalidations(session):
+    session.info.pop("tenant_context_keys", None)
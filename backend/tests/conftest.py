@@ -0,0 +1,8 @@
+import os
+import sys
+import tempfile
+
+# The backend modules import each other as top-level modules and read
+# DATABASE_URL at import time, so both must be set before any test imports them.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='backend_tests_'), 'test.db')}"
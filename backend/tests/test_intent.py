@@ -0,0 +1,46 @@
+import pytest
+
+from intent import extract_issue
+
+
+@pytest.mark.parametrize(
+    "message",
+    [
+        # Fixtures and rooms without a fault
+        "the bathroom sink looks great after the repair",
+        "the plumber came and the kitchen sink is good",
+        "rent for the bedroom is too high, the kitchen sink is fine though",
+        "the kitchen is lovely",
+        # Negated, past tense or fixed
+        "the kitchen sink isn't leaking anymore",
+        "the kitchen light is working again",
+        "there was a leak in the bathroom last year",
+        # Questions
+        "is the plumber coming to fix the kitchen sink?",
+        "who is my landlord",
+    ],
+)
+def test_non_reports_are_left_to_the_llm(message):
+    assert extract_issue(message) is None
+
+
+@pytest.mark.parametrize(
+    "message, location, action",
+    [
+        ("my kitchen sink is leaking", "Kitchen", "Send a plumber"),
+        ("the kitchen sink in unit 4 is leaking, needs a plumber", "Kitchen", "Send a plumber"),
+        ("the heating in my bedroom stopped working", "Bedroom", "Send an HVAC technician"),
+        ("the outlet in the living room is sparking", "Living room", "Send an electrician"),
+        ("we have mice in the kitchen", "Kitchen", "Send pest control"),
+    ],
+)
+def test_clear_reports_take_the_fast_path(message, location, action):
+    issue = extract_issue(message)
+    assert issue is not None
+    assert (issue["location"], issue["action"]) == (location, action)
+
+
+def test_property_id_is_extracted():
+    issue = extract_issue("there is no heat in the bedroom of property 3")
+    assert issue is not None
+    assert issue["property_id"] == 3
@@ -0,0 +1,70 @@
+import threading
+
+import pytest
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import sessionmaker
+
+import api  # noqa: F401  (registers every model and write hook)
+import write_coalescer
+from database import SQLALCHEMY_DATABASE_URL
+from models.base import Base
+from models.issue import Issue
+from models.landlord import Landlord
+from models.property import Property
+from write_coalescer import WriteCoalescer, coalesced_create
+
+
+@pytest.fixture
+def small_pool(monkeypatch):
+    """A session factory whose pool is smaller than the number of callers, with coalescing on."""
+    engine = create_engine(
+        SQLALCHEMY_DATABASE_URL,
+        connect_args={"check_same_thread": False},
+        pool_size=2,
+        max_overflow=0,
+        pool_timeout=5,
+    )
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    with factory() as db:
+        db.add(Landlord(name="L", phone_number="555", email="l@example.com"))
+        db.add(Property(address="1 Main St", landlord_id=1))
+        db.commit()
+
+    coalescer = WriteCoalescer(session_factory=factory)
+    monkeypatch.setattr(write_coalescer, "WRITE_COALESCING", True)
+    monkeypatch.setattr(write_coalescer, "_coalescer", coalescer)
+    yield factory
+    coalescer.stop()
+    engine.dispose()
+
+
+def test_concurrent_creates_are_not_lost(small_pool):
+    # Like the API and the assistant: check the property on the caller's own
+    # session, then create the issue through the coalescer
+    callers = 12
+    errors = []
+
+    def create(n):
+        try:
+            with small_pool() as db:
+                assert Property.get(db, 1) is not None
+                issue = coalesced_create(
+                    db,
+                    Issue,
+                    {"description": f"issue {n}", "location": "kitchen", "action": "fix", "property_id": 1},
+                )
+                assert issue.id is not None
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=create, args=(n,)) for n in range(callers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    with small_pool() as db:
+        assert db.scalar(select(func.count()).select_from(Issue)) == callers
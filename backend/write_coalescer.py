@@ -0,0 +1,161 @@
+"""Group commit for high-rate inserts.
+
+Concurrent callers hand their rows to a single writer thread, which inserts
+them in small batches (up to ``max_rows`` rows, waiting at most ``max_delay``
+seconds after the first) with one transaction per batch. Each caller gets
+back its own object with the id assigned by the database.
+
+Coalescing is off unless ``WRITE_COALESCING=1``; callers should go through
+``coalesced_create``, which falls back to ``Model.create`` when disabled and
+releases the caller's connection while it waits when enabled.
+"""
+
+import logging
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+from sqlalchemy.orm import Session
+
+from database import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+WRITE_COALESCING = os.getenv("WRITE_COALESCING", "0") == "1"
+WRITE_COALESCE_DELAY_MS = float(os.getenv("WRITE_COALESCE_DELAY_MS", "5"))
+WRITE_COALESCE_MAX_ROWS = int(os.getenv("WRITE_COALESCE_MAX_ROWS", "64"))
+
+_STOP = object()
+
+
+class WriteCoalescer:
+    def __init__(self, session_factory=SessionLocal, max_delay: float = 0.005, max_rows: int = 64):
+        self.session_factory = session_factory
+        self.max_delay = max_delay
+        self.max_rows = max_rows
+        self._queue = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def submit(self, model, data: dict) -> Future:
+        """Queue an insert; the future resolves to the committed object."""
+        self._ensure_started()
+        future = Future()
+        self._queue.put((model, data, future))
+        return future
+
+    def create(self, model, data: dict):
+        """Insert a row through the coalescer and wait for it to commit."""
+        return self.submit(model, data).result()
+
+    def stop(self):
+        """Flush everything queued so far and stop the writer thread."""
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            self._queue.put(_STOP)
+            thread.join()
+
+    def _ensure_started(self):
+        if self._thread is None:
+            with self._lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(
+                        target=self._run, name="write-coalescer", daemon=True
+                    )
+                    self._thread.start()
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is _STOP:
+                return
+            batch = [item]
+            stopping = False
+            deadline = time.monotonic() + self.max_delay
+            while len(batch) < self.max_rows:
+                timeout = deadline - time.monotonic()
+                try:
+                    item = self._queue.get(timeout=timeout) if timeout > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+            self._commit(batch)
+            if stopping:
+                return
+
+    def _commit(self, batch):
+        # Objects stay loaded after commit so callers can read them without a session
+        db: Session = self.session_factory(expire_on_commit=False)
+        try:
+            pending = []
+            for model, data, future in batch:
+                try:
+                    obj = model(**data)
+                except Exception as e:
+                    future.set_exception(e)
+                    continue
+                db.add(obj)
+                pending.append((obj, future))
+            if not pending:
+                return
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            if len(pending) == 1:
+                pending[0][1].set_exception(e)
+            else:
+                # Retry one by one so a single bad row does not fail the batch
+                logger.warning("Batch of %d writes failed, retrying individually: %s", len(batch), e)
+                for item in batch:
+                    if not item[2].done():
+                        self._commit([item])
+            return
+        finally:
+            db.close()
+
+        for obj, future in pending:
+            future.set_result(obj)
+
+
+_coalescer = None
+_coalescer_lock = threading.Lock()
+
+
+def get_write_coalescer():
+    """Return the shared coalescer, or None when coalescing is disabled."""
+    global _coalescer
+    if not WRITE_COALESCING:
+        return None
+    if _coalescer is None:
+        with _coalescer_lock:
+            if _coalescer is None:
+                _coalescer = WriteCoalescer(
+                    max_delay=WRITE_COALESCE_DELAY_MS / 1000,
+                    max_rows=WRITE_COALESCE_MAX_ROWS,
+                )
+    return _coalescer
+
+
+def stop_write_coalescer():
+    if _coalescer is not None:
+        _coalescer.stop()
+
+
+def coalesced_create(db: Session, model, data: dict):
+    """Create ``model`` from ``data``, group-committed when coalescing is enabled.
+
+    When coalescing, ``db`` is committed first so the caller's pooled
+    connection is returned before it waits: otherwise a burst of waiting
+    callers can hold every connection the writer thread needs.
+    """
+    coalescer = get_write_coalescer()
+    if coalescer is None:
+        return model.create(db, data)
+    db.commit()
+    return coalescer.create(model, data)